@@ -0,0 +1,91 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# ---------------- Shared SQLite connections for the Streamlit apps ----------------
+# Streamlit re-executes the app script on every rerun, but imported modules stay loaded, so the
+# pools kept here live for the whole server process: reruns and concurrent sessions reuse open
+# connections (and their parsed schema and page cache) instead of connecting per rerun or button.
+#   acquire()/release(), reader() -> one of POOL_SIZE read-only connections
+#                                   (mode=ro, query_only, memory-mapped reads), one user at a time
+#   writer()                      -> the single read-write connection; one transaction at a time,
+#                                   committed on success and rolled back on error
+# There is one copy per project (Nutrition/, Harvard_Artifact_Collection/,
+# Harvards_Artifacts_Collection/harvard_objects_scripts/): each project's scripts are run from
+# their own directory and import their siblings, and there is no shared package to install this
+# from. Keep the copies byte-for-byte identical (LF line endings).
+POOL_SIZE = int(os.environ.get("SQLITE_POOL_SIZE", 4))
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE, mmap_size=MMAP_SIZE):
+        self.path = path
+        self.size = size
+        self.mmap_size = mmap_size
+        self._idle = queue.LifoQueue()   # most recently used first, its pages are warmest
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer = None
+
+    def _open_reader(self):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    # Opens connections lazily up to size, then waits for one to be released
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._opened < self.size
+            if grow:
+                self._opened += 1
+        if not grow:
+            return self._idle.get()
+        try:
+            return self._open_reader()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def reader(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def writer(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = sqlite3.connect(self.path, check_same_thread=False)
+            with self._writer:
+                yield self._writer
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+# One pool per database file per process
+def get_pool(path, size=POOL_SIZE):
+    path = os.path.abspath(path)
+    with _pools_lock:
+        if path not in _pools:
+            _pools[path] = ConnectionPool(path, size)
+        return _pools[path]
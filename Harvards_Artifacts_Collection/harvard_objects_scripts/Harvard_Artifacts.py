@@ -1,64 +1,66 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
 import requests
+from db_pool import get_pool
 
 # ------------------------------
 # 1. Database Setup
 # ------------------------------
 DB_PATH = "harvard_artifacts.db"
 
+# Process-wide connections (db_pool.py): read-only pool for queries, one serialized writer
+pool = get_pool(DB_PATH)
+
+# Schema is created once per server process, not on every rerun
+@st.cache_resource
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Metadata table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS artifact_metadata (
-        id INTEGER PRIMARY KEY,
-        title TEXT,
-        culture TEXT,
-        period TEXT,
-        century TEXT,
-        medium TEXT,
-        dimensions TEXT,
-        description TEXT,
-        department TEXT,
-        classification TEXT,
-        accessionyear INTEGER,
-        accessionmethod TEXT
-    )
-    """)
-    
-    # Media table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS artifact_media (
-        objectid INTEGER,
-        imagecount INTEGER,
-        mediacount INTEGER,
-        colorcount INTEGER,
-        rank INTEGER,
-        datebegin INTEGER,
-        dateend INTEGER,
-        FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
-    )
-    """)
-    
-    # Colors table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS artifact_colors (
-        objectid INTEGER,
-        color TEXT,
-        spectrum TEXT,
-        hue TEXT,
-        percent REAL,
-        css3 TEXT,
-        FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
-    )
-    """)
-    
-    conn.commit()
-    conn.close()
+    with pool.writer() as conn:
+        cursor = conn.cursor()
+
+        # Metadata table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_metadata (
+            id INTEGER PRIMARY KEY,
+            title TEXT,
+            culture TEXT,
+            period TEXT,
+            century TEXT,
+            medium TEXT,
+            dimensions TEXT,
+            description TEXT,
+            department TEXT,
+            classification TEXT,
+            accessionyear INTEGER,
+            accessionmethod TEXT
+        )
+        """)
+
+        # Media table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_media (
+            objectid INTEGER,
+            imagecount INTEGER,
+            mediacount INTEGER,
+            colorcount INTEGER,
+            rank INTEGER,
+            datebegin INTEGER,
+            dateend INTEGER,
+            FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
+        )
+        """)
+
+        # Colors table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_colors (
+            objectid INTEGER,
+            color TEXT,
+            spectrum TEXT,
+            hue TEXT,
+            percent REAL,
+            css3 TEXT,
+            FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
+        )
+        """)
 
 init_db()
 
@@ -218,45 +220,44 @@ if migrate_sql_btn:
     if not metadata_rows:
         st.error("No data collected yet! Click 'Collect Data' first.")
     else:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Insert metadata
-        cursor.executemany("""
-            INSERT OR IGNORE INTO artifact_metadata 
-            (id, title, culture, period, century, medium, dimensions, description, department, classification, accessionyear, accessionmethod)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [(m["id"], m["title"], m["culture"], m["period"], m["century"], m["medium"], m["dimensions"], m["description"],
-               m["department"], m["classification"], m["accessionyear"], m["accessionmethod"]) for m in metadata_rows])
-
-        # Insert media
-        cursor.executemany("""
-            INSERT OR IGNORE INTO artifact_media 
-            (objectid, imagecount, mediacount, colorcount, rank, datebegin, dateend)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, [(m["objectid"], m["imagecount"], m["mediacount"], m["colorcount"], m["rank"], m["datebegin"], m["dateend"]) for m in media_rows])
-
-        # Insert colors
-        cursor.executemany("""
-            INSERT OR IGNORE INTO artifact_colors
-            (objectid, color, spectrum, hue, percent, css3)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, [(c["objectid"], c["color"], c["spectrum"], c["hue"], c["percent"], c["css3"]) for c in color_rows])
-
-        conn.commit()
+        with pool.writer() as conn:
+            cursor = conn.cursor()
+
+            # Insert metadata
+            cursor.executemany("""
+                INSERT OR IGNORE INTO artifact_metadata 
+                (id, title, culture, period, century, medium, dimensions, description, department, classification, accessionyear, accessionmethod)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(m["id"], m["title"], m["culture"], m["period"], m["century"], m["medium"], m["dimensions"], m["description"],
+                   m["department"], m["classification"], m["accessionyear"], m["accessionmethod"]) for m in metadata_rows])
+
+            # Insert media
+            cursor.executemany("""
+                INSERT OR IGNORE INTO artifact_media 
+                (objectid, imagecount, mediacount, colorcount, rank, datebegin, dateend)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(m["objectid"], m["imagecount"], m["mediacount"], m["colorcount"], m["rank"], m["datebegin"], m["dateend"]) for m in media_rows])
+
+            # Insert colors
+            cursor.executemany("""
+                INSERT OR IGNORE INTO artifact_colors
+                (objectid, color, spectrum, hue, percent, css3)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(c["objectid"], c["color"], c["spectrum"], c["hue"], c["percent"], c["css3"]) for c in color_rows])
 
         st.subheader("All Inserted Records for Current Classification")
-        df_meta = pd.read_sql_query(f"SELECT * FROM artifact_metadata WHERE classification=? ORDER BY id LIMIT 10", conn, params=(selected_classification,))
-        df_media = pd.read_sql_query(f"""
-            SELECT * FROM artifact_media 
-            WHERE objectid IN (SELECT id FROM artifact_metadata WHERE classification=?)
-            ORDER BY objectid LIMIT 10
-        """, conn, params=(selected_classification,))
-        df_colors = pd.read_sql_query(f"""
-            SELECT * FROM artifact_colors 
-            WHERE objectid IN (SELECT id FROM artifact_metadata WHERE classification=?)
-            ORDER BY objectid LIMIT 10
-        """, conn, params=(selected_classification,))
+        with pool.reader() as conn:
+            df_meta = pd.read_sql_query(f"SELECT * FROM artifact_metadata WHERE classification=? ORDER BY id LIMIT 10", conn, params=(selected_classification,))
+            df_media = pd.read_sql_query(f"""
+                SELECT * FROM artifact_media 
+                WHERE objectid IN (SELECT id FROM artifact_metadata WHERE classification=?)
+                ORDER BY objectid LIMIT 10
+            """, conn, params=(selected_classification,))
+            df_colors = pd.read_sql_query(f"""
+                SELECT * FROM artifact_colors 
+                WHERE objectid IN (SELECT id FROM artifact_metadata WHERE classification=?)
+                ORDER BY objectid LIMIT 10
+            """, conn, params=(selected_classification,))
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -269,8 +270,6 @@ if migrate_sql_btn:
             st.write("**Colors Table**")
             st.dataframe(df_colors)
 
-        conn.close()
-
 # ------------------------------
 # 6. SQL Queries Section
 # ------------------------------
@@ -322,21 +321,18 @@ if st.session_state.show_sql_queries:
 
     # Run Query button
     if st.button("Run Query"):
-        conn = sqlite3.connect(DB_PATH)
-
         if selected_query == query_options[13]:
             if not artifact_id_input.strip():
                 st.error("Please enter an Artifact ID.")
-                conn.close()
             else:
-                df = pd.read_sql_query(
-                    "SELECT DISTINCT color FROM artifact_colors WHERE objectid=?",
-                    conn,
-                    params=(artifact_id_input.strip(),)
-                )
+                with pool.reader() as conn:
+                    df = pd.read_sql_query(
+                        "SELECT DISTINCT color FROM artifact_colors WHERE objectid=?",
+                        conn,
+                        params=(artifact_id_input.strip(),)
+                    )
                 st.subheader("Query Results")
                 st.dataframe(df)
-                conn.close()
         else:
             # Queries with classification parameter
             queries = {
@@ -522,7 +518,7 @@ if st.session_state.show_sql_queries:
 
             # Run the query with classification
             params = (selected_classification,) if selected_query != query_options[29] else (selected_classification, selected_classification)
-            df = pd.read_sql_query(queries[selected_query], conn, params=params)
+            with pool.reader() as conn:
+                df = pd.read_sql_query(queries[selected_query], conn, params=params)
             st.subheader("Query Results")
             st.dataframe(df)
-            conn.close()
@@ -4,65 +4,67 @@
 
 import streamlit  as st
 import requests
-import sqlite3
 import pandas as pd
+from db_pool import get_pool
 
 # ------------------------------
 # 1. Database Setup
 # ------------------------------
 DB_PATH = "harvard_artifacts.db"
 
+# Process-wide connections (db_pool.py): read-only pool for queries, one serialized writer
+pool = get_pool(DB_PATH)
+
+# Schema is created once per server process, not on every rerun
+@st.cache_resource
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Metadata table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS artifact_metadata (
-        id INTEGER PRIMARY KEY,
-        title TEXT,
-        culture TEXT,
-        period TEXT,
-        century TEXT,
-        medium TEXT,
-        dimensions TEXT,
-        description TEXT,
-        department TEXT,
-        classification TEXT,
-        accessionyear INTEGER,
-        accessionmethod TEXT
-    )
-    """)
-    
-    # Media table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS artifact_media (
-        objectid INTEGER,
-        imagecount INTEGER,
-        mediacount INTEGER,
-        colorcount INTEGER,
-        rank INTEGER,
-        datebegin INTEGER,
-        dateend INTEGER,
-        FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
-    )
-    """)
-    
-    # Colors table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS artifact_colors (
-        objectid INTEGER,
-        color TEXT,
-        spectrum TEXT,
-        hue TEXT,
-        percent REAL,
-        css3 TEXT,
-        FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
-    )
-    """)
-    
-    conn.commit()
-    conn.close()
+    with pool.writer() as conn:
+        cursor = conn.cursor()
+
+        # Metadata table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_metadata (
+            id INTEGER PRIMARY KEY,
+            title TEXT,
+            culture TEXT,
+            period TEXT,
+            century TEXT,
+            medium TEXT,
+            dimensions TEXT,
+            description TEXT,
+            department TEXT,
+            classification TEXT,
+            accessionyear INTEGER,
+            accessionmethod TEXT
+        )
+        """)
+
+        # Media table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_media (
+            objectid INTEGER,
+            imagecount INTEGER,
+            mediacount INTEGER,
+            colorcount INTEGER,
+            rank INTEGER,
+            datebegin INTEGER,
+            dateend INTEGER,
+            FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
+        )
+        """)
+
+        # Colors table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artifact_colors (
+            objectid INTEGER,
+            color TEXT,
+            spectrum TEXT,
+            hue TEXT,
+            percent REAL,
+            css3 TEXT,
+            FOREIGN KEY(objectid) REFERENCES artifact_metadata(id)
+        )
+        """)
 
 init_db()
 
@@ -188,19 +190,17 @@ if st.button("Collect & Store Data"):
         status_text.text(f"Fetched {total_fetched} / {MAX_RECORDS} objects...")
 
     # Insert into SQLite
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.executemany("""
-    INSERT OR IGNORE INTO artifact_metadata VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, metadata_rows)
-    cursor.executemany("""
-    INSERT OR IGNORE INTO artifact_media VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, media_rows)
-    cursor.executemany("""
-    INSERT OR IGNORE INTO artifact_colors VALUES (?, ?, ?, ?, ?, ?)
-    """, color_rows)
-    conn.commit()
-    conn.close()
+    with pool.writer() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+        INSERT OR IGNORE INTO artifact_metadata VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, metadata_rows)
+        cursor.executemany("""
+        INSERT OR IGNORE INTO artifact_media VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, media_rows)
+        cursor.executemany("""
+        INSERT OR IGNORE INTO artifact_colors VALUES (?, ?, ?, ?, ?, ?)
+        """, color_rows)
 
     st.success(f"Inserted {total_fetched} objects for classification: {selected_classification}")
     st.subheader("Sample Metadata Preview")
@@ -244,89 +244,88 @@ selected_query = st.selectbox("Select a query", query_options)
 artifact_id_input = st.text_input("Enter Artifact ID (only for 'Colors for a given artifact ID'):")
 
 if st.button("Run Query"):
-    conn = sqlite3.connect(DB_PATH)
-    
-    if selected_query == "Artifacts from 11th century Byzantine culture":
-        df = pd.read_sql_query(
-            "SELECT * FROM artifact_metadata WHERE century='11th century' AND culture='Byzantine'", conn)
-    elif selected_query == "Unique cultures represented":
-        df = pd.read_sql_query(
-            "SELECT DISTINCT culture FROM artifact_metadata", conn)
-    elif selected_query == "Artifacts from Archaic Period":
-        df = pd.read_sql_query(
-            "SELECT * FROM artifact_metadata WHERE period='Archaic Period'", conn)
-    elif selected_query == "Artifact titles by descending accession year":
-        df = pd.read_sql_query(
-            "SELECT title, accessionyear FROM artifact_metadata ORDER BY accessionyear DESC", conn)
-    elif selected_query == "Number of artifacts per department":
-        df = pd.read_sql_query(
-            "SELECT department, COUNT(*) as count FROM artifact_metadata GROUP BY department", conn)
-    elif selected_query == "Artifacts with more than 1 image":
-        df = pd.read_sql_query(
-            "SELECT * FROM artifact_media WHERE imagecount > 1", conn)
-    elif selected_query == "Average rank of artifacts":
-        df = pd.read_sql_query(
-            "SELECT AVG(rank) as average_rank FROM artifact_media", conn)
-    elif selected_query == "Artifacts with colorcount > mediacount":
-        df = pd.read_sql_query(
-            "SELECT * FROM artifact_media WHERE colorcount > mediacount", conn)
-    elif selected_query == "Artifacts created between 1500 and 1600":
-        df = pd.read_sql_query(
-            "SELECT * FROM artifact_media WHERE datebegin >= 1500 AND dateend <= 1600", conn)
-    elif selected_query == "Artifacts with no media files":
-        df = pd.read_sql_query(
-            "SELECT * FROM artifact_media WHERE mediacount=0 OR mediacount IS NULL", conn)
-    elif selected_query == "Distinct hues used":
-        df = pd.read_sql_query(
-            "SELECT DISTINCT hue FROM artifact_colors", conn)
-    elif selected_query == "Top 5 most used colors":
-        df = pd.read_sql_query(
-            "SELECT color, COUNT(*) as freq FROM artifact_colors GROUP BY color ORDER BY freq DESC LIMIT 5", conn)
-    elif selected_query == "Average coverage percentage per hue":
-        df = pd.read_sql_query(
-            "SELECT hue, AVG(percent) as avg_percent FROM artifact_colors GROUP BY hue", conn)
-    elif selected_query == "Colors for a given artifact ID":
-        if artifact_id_input.strip() == "":
-            st.error("Please enter an Artifact ID!")
-            conn.close()
-            st.stop()
-        df = pd.read_sql_query(
-            f"SELECT * FROM artifact_colors WHERE objectid={artifact_id_input}", conn)
-    elif selected_query == "Total number of color entries":
-        df = pd.read_sql_query(
-            "SELECT COUNT(*) as total_colors FROM artifact_colors", conn)
-    elif selected_query == "Artifact titles and hues for Byzantine culture":
-        df = pd.read_sql_query(
-            """SELECT m.title, c.hue 
-               FROM artifact_metadata m
-               JOIN artifact_colors c ON m.id=c.objectid
-               WHERE m.culture='Byzantine'""", conn)
-    elif selected_query == "Each artifact title with associated hues":
-        df = pd.read_sql_query(
-            """SELECT m.title, c.hue
-               FROM artifact_metadata m
-               JOIN artifact_colors c ON m.id=c.objectid""", conn)
-    elif selected_query == "Artifact titles, cultures, media ranks where period is not null":
-        df = pd.read_sql_query(
-            """SELECT m.title, m.culture, md.rank 
-               FROM artifact_metadata m
-               JOIN artifact_media md ON m.id=md.objectid
-               WHERE m.period IS NOT NULL""", conn)
-    elif selected_query == "Top 10 artifacts including hue 'Grey'":
-        df = pd.read_sql_query(
-            """SELECT m.title, md.rank, c.hue
-               FROM artifact_metadata m
-               JOIN artifact_media md ON m.id=md.objectid
-               JOIN artifact_colors c ON m.id=c.objectid
-               WHERE c.hue='Grey'
-               ORDER BY md.rank DESC
-               LIMIT 10""", conn)
-    elif selected_query == "Number of artifacts per classification and avg media count":
-        df = pd.read_sql_query(
-            """SELECT m.classification, COUNT(*) as total_artifacts, AVG(md.mediacount) as avg_mediacount
-               FROM artifact_metadata m
-               JOIN artifact_media md ON m.id=md.objectid
-               GROUP BY m.classification""", conn)
+    if selected_query == "Colors for a given artifact ID" and artifact_id_input.strip() == "":
+        st.error("Please enter an Artifact ID!")
+        st.stop()
+
+    with pool.reader() as conn:
     
+        if selected_query == "Artifacts from 11th century Byzantine culture":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_metadata WHERE century='11th century' AND culture='Byzantine'", conn)
+        elif selected_query == "Unique cultures represented":
+            df = pd.read_sql_query(
+                "SELECT DISTINCT culture FROM artifact_metadata", conn)
+        elif selected_query == "Artifacts from Archaic Period":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_metadata WHERE period='Archaic Period'", conn)
+        elif selected_query == "Artifact titles by descending accession year":
+            df = pd.read_sql_query(
+                "SELECT title, accessionyear FROM artifact_metadata ORDER BY accessionyear DESC", conn)
+        elif selected_query == "Number of artifacts per department":
+            df = pd.read_sql_query(
+                "SELECT department, COUNT(*) as count FROM artifact_metadata GROUP BY department", conn)
+        elif selected_query == "Artifacts with more than 1 image":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_media WHERE imagecount > 1", conn)
+        elif selected_query == "Average rank of artifacts":
+            df = pd.read_sql_query(
+                "SELECT AVG(rank) as average_rank FROM artifact_media", conn)
+        elif selected_query == "Artifacts with colorcount > mediacount":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_media WHERE colorcount > mediacount", conn)
+        elif selected_query == "Artifacts created between 1500 and 1600":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_media WHERE datebegin >= 1500 AND dateend <= 1600", conn)
+        elif selected_query == "Artifacts with no media files":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_media WHERE mediacount=0 OR mediacount IS NULL", conn)
+        elif selected_query == "Distinct hues used":
+            df = pd.read_sql_query(
+                "SELECT DISTINCT hue FROM artifact_colors", conn)
+        elif selected_query == "Top 5 most used colors":
+            df = pd.read_sql_query(
+                "SELECT color, COUNT(*) as freq FROM artifact_colors GROUP BY color ORDER BY freq DESC LIMIT 5", conn)
+        elif selected_query == "Average coverage percentage per hue":
+            df = pd.read_sql_query(
+                "SELECT hue, AVG(percent) as avg_percent FROM artifact_colors GROUP BY hue", conn)
+        elif selected_query == "Colors for a given artifact ID":
+            df = pd.read_sql_query(
+                "SELECT * FROM artifact_colors WHERE objectid=?", conn, params=(artifact_id_input.strip(),))
+        elif selected_query == "Total number of color entries":
+            df = pd.read_sql_query(
+                "SELECT COUNT(*) as total_colors FROM artifact_colors", conn)
+        elif selected_query == "Artifact titles and hues for Byzantine culture":
+            df = pd.read_sql_query(
+                """SELECT m.title, c.hue 
+                   FROM artifact_metadata m
+                   JOIN artifact_colors c ON m.id=c.objectid
+                   WHERE m.culture='Byzantine'""", conn)
+        elif selected_query == "Each artifact title with associated hues":
+            df = pd.read_sql_query(
+                """SELECT m.title, c.hue
+                   FROM artifact_metadata m
+                   JOIN artifact_colors c ON m.id=c.objectid""", conn)
+        elif selected_query == "Artifact titles, cultures, media ranks where period is not null":
+            df = pd.read_sql_query(
+                """SELECT m.title, m.culture, md.rank 
+                   FROM artifact_metadata m
+                   JOIN artifact_media md ON m.id=md.objectid
+                   WHERE m.period IS NOT NULL""", conn)
+        elif selected_query == "Top 10 artifacts including hue 'Grey'":
+            df = pd.read_sql_query(
+                """SELECT m.title, md.rank, c.hue
+                   FROM artifact_metadata m
+                   JOIN artifact_media md ON m.id=md.objectid
+                   JOIN artifact_colors c ON m.id=c.objectid
+                   WHERE c.hue='Grey'
+                   ORDER BY md.rank DESC
+                   LIMIT 10""", conn)
+        elif selected_query == "Number of artifacts per classification and avg media count":
+            df = pd.read_sql_query(
+                """SELECT m.classification, COUNT(*) as total_artifacts, AVG(md.mediacount) as avg_mediacount
+                   FROM artifact_metadata m
+                   JOIN artifact_media md ON m.id=md.objectid
+                   GROUP BY m.classification""", conn)
+
     st.dataframe(df)
-    conn.close()
@@ -1,10 +1,38 @@
+import os
+import time
 import streamlit as st
-import sqlite3
-import pandas as pd
 import altair as alt
+from backends import DB_PATH, open_backend
+from chart_plan import category_data, describe, year_data
+from db_pool import get_pool
+from forecast import country_forecast, forecast_settings, has_forecasts
+from paging import Pager
+from schema import TABLES
+from result_cache import ResultCache
+from trends import FLAT_SLOPE, direction_counts, has_trends, series_trends
+
+# ----------------------- Connect (SQLite, or NUTRITION_BACKEND=duckdb) -----------------------
+# One backend per server process, like the result cache below: the DuckDB views over the files
+# (or the SQLite pool) are set up once, not on every rerun, and stay open while the server runs
+@st.cache_resource
+def get_backend():
+    return open_backend()
+
+
+backend = get_backend()
+
+
+# One result cache per server process, shared by all sessions; entries are keyed by the data
+# version, so a reload (database.py / refresh_data.py) invalidates them
+@st.cache_resource
+def result_cache():
+    return ResultCache()
+
+
+# Catalog queries, their pages (paging.py) and chart reductions (chart_plan.py) all go through it
+def run_query(name, sql, params=None):
+    return result_cache().query(backend, name, sql, params)
 
-# ----------------------- Connect to SQLite -----------------------
-conn = sqlite3.connect("nutrition.db")
 
 # ----------------------- Queries Dictionary (25 Queries) -----------------------
 queries = {
@@ -151,13 +179,28 @@ queries = {
         ORDER BY Avg_Malnutrition ASC;
     """,
 
-    "Countries with increasing malnutrition": """
+    # Rising series (Country x Gender x age_group): least-squares slope of the yearly averages
+    # above trends.FLAT_SLOPE points per year (SQLite answers it from trend_malnutrition);
+    # Year is widened for Year * Year (DuckDB reads it as a 16-bit column from Parquet)
+    "Countries with increasing malnutrition": f"""
         SELECT Country,
-        MIN(Mean_Estimate) AS Min_Value,
-        MAX(Mean_Estimate) AS Max_Value
-        FROM malnutrition
+        COUNT(*) AS Rising_Series,
+        MAX(slope) AS Max_Slope
+        FROM (
+            SELECT Country, Gender, age_group,
+            (COUNT(*) * SUM(Year * estimate) - SUM(Year) * SUM(estimate))
+                / NULLIF(COUNT(*) * SUM(Year * Year) - SUM(Year) * SUM(Year), 0) AS slope
+            FROM (
+                SELECT Country, Gender, age_group, CAST(Year AS INTEGER) AS Year, AVG(Mean_Estimate) AS estimate
+                FROM malnutrition
+                WHERE Year IS NOT NULL AND Mean_Estimate IS NOT NULL
+                GROUP BY Country, Gender, age_group, Year
+            )
+            GROUP BY Country, Gender, age_group
+        )
+        WHERE slope > {FLAT_SLOPE}
         GROUP BY Country
-        HAVING Max_Value > Min_Value;
+        ORDER BY Max_Slope DESC, Country;
     """,
 
     "Min/Max malnutrition levels year-wise comparison": """
@@ -241,42 +284,61 @@ st.markdown("Select a query from the dropdown to view results and charts:")
 selected_query_name = st.selectbox("Choose Query", list(queries.keys()))
 
 query = queries[selected_query_name]
-df = pd.read_sql_query(query, conn)
+pager = Pager(run_query, backend, selected_query_name, query)
+
+# Positions of the pages visited for this query; the last one is shown
+positions = st.session_state.setdefault(f"pages:{selected_query_name}", [pager.start])
+df, next_position = pager.page(positions[-1])
+first_row = (len(positions) - 1) * pager.rows
 
 st.subheader("Query Result")
 st.dataframe(df)
+prev_col, rows_col, next_col = st.columns([1, 4, 1])
+prev_col.button("Previous", disabled=len(positions) == 1, on_click=positions.pop)
+next_col.button("Next", disabled=first_row + len(df) >= pager.total,
+                on_click=positions.append, args=(next_position,))
+if pager.total:
+    rows_col.caption(f"Rows {first_row + 1:,}–{first_row + len(df):,} of {pager.total:,}")
+else:
+    rows_col.caption("No rows")
 
 # ----------------------- Auto Charting -----------------------
+# Large results are reduced in SQL before charting (chart_plan.py)
 if not df.empty:
 
-    for col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors='ignore')
-
+    # fetch.py returns typed columns, numbers are already numeric
     numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
     object_cols = [c for c in df.columns if c not in numeric_cols]
+    start = time.perf_counter()
+    charts = []
 
     if len(numeric_cols) == 1 and len(object_cols) >= 1:
         x = object_cols[0]
         y = numeric_cols[0]
-        chart = alt.Chart(df).mark_bar().encode(
+        data, info = category_data(run_query, selected_query_name, query, df, x, [y], pager.total)
+        chart = alt.Chart(data).mark_bar().encode(
             x=alt.X(f"{x}:N", sort='-y'),
             y=alt.Y(f"{y}:Q"),
             tooltip=[x, y]
         )
         st.altair_chart(chart, use_container_width=True)
+        charts.append(chart)
 
     elif "Year" in df.columns and len(numeric_cols) >= 1:
+        data, info = year_data(run_query, selected_query_name, query, df, numeric_cols, pager.total)
         for y in numeric_cols:
-            chart = alt.Chart(df).mark_line(point=True).encode(
+            chart = alt.Chart(data).mark_line(point=True).encode(
                 x="Year:O",
                 y=alt.Y(f"{y}:Q"),
                 tooltip=["Year", y]
             )
             st.altair_chart(chart, use_container_width=True)
+            charts.append(chart)
 
     elif len(numeric_cols) > 1 and len(object_cols) >= 1:
         id_var = object_cols[0]
-        df_long = df.melt(id_vars=[id_var], value_vars=numeric_cols,
+        data, info = category_data(run_query, selected_query_name, query, df, id_var, numeric_cols, pager.total)
+        df_long = data.melt(id_vars=[id_var], value_vars=numeric_cols,
                           var_name="Metric", value_name="Value")
         chart = alt.Chart(df_long).mark_bar().encode(
             x=f"{id_var}:N",
@@ -285,8 +347,77 @@ if not df.empty:
             tooltip=[id_var, "Metric", "Value"]
         )
         st.altair_chart(chart, use_container_width=True)
+        charts.append(chart)
 
     else:
         st.warning("No numeric columns detected for charting.")
 
-conn.close()
\ No newline at end of file
+    if charts:
+        st.caption(describe(info, charts, time.perf_counter() - start))
+
+# ----------------------- Rising and falling series -----------------------
+# database.py writes trend_<table> into nutrition.db; each direction is read from its direction index
+st.subheader("Rising and falling series")
+trend_datasets = []
+if os.path.exists(DB_PATH):
+    with get_pool(DB_PATH).reader() as conn:
+        trend_datasets = [t for t in TABLES if has_trends(conn, t)]
+if not trend_datasets:
+    st.info("Run database.py to build the year-over-year trend tables.")
+else:
+    trend_dataset = st.selectbox("Trend dataset", trend_datasets)
+    direction = st.radio("Direction", ["up", "down", "flat"], horizontal=True)
+    with get_pool(DB_PATH).reader() as conn:
+        counts = direction_counts(conn, trend_dataset)
+        trends = series_trends(conn, trend_dataset, direction=direction, limit=50)
+
+    st.dataframe(trends)
+    if not trends.empty:
+        trends["Series"] = (trends["Country"].astype(str) + " / " + trends["Gender"].astype(str)
+                            + " / " + trends["age_group"].astype(str))
+        chart = alt.Chart(trends).mark_bar().encode(
+            x=alt.X("slope:Q", title="Points per year"),
+            y=alt.Y("Series:N", sort=None),
+            tooltip=["Series", "first_year", "last_year", "latest", "change", "slope"]
+        )
+        st.altair_chart(chart, use_container_width=True)
+    st.caption(f"Steepest {len(trends):,} of {counts.get(direction, 0):,} series going {direction} "
+               f"(all directions: {', '.join(f'{d} {n:,}' for d, n in sorted(counts.items()))})")
+
+# ----------------------- Projections -----------------------
+# forecast.py writes forecast_<table> into nutrition.db, database.py / refresh_data.py refit it on
+# every load (both backends read it from there); horizon and models are those it was built with.
+# A table with no series long enough to project has an empty forecast_<table> and is left out
+settings = {}
+if os.path.exists(DB_PATH):
+    with get_pool(DB_PATH).reader() as conn:
+        settings = {t: forecast_settings(conn, t) for t in TABLES if has_forecasts(conn, t)
+                    and conn.execute(f"SELECT 1 FROM forecast_{t} LIMIT 1").fetchone()}
+if not settings:
+    st.subheader("Projections")
+    st.info("Run forecast.py to project every country / gender / age group series.")
+else:
+    st.subheader(f"Projections to {max(horizon for horizon, _ in settings.values())}")
+    dataset = st.selectbox("Dataset", list(settings))
+    model = st.radio("Model", sorted(settings[dataset][1]), horizontal=True)
+    with get_pool(DB_PATH).reader() as conn:
+        countries = [row[0] for row in conn.execute(f"SELECT DISTINCT Country FROM forecast_{dataset} ORDER BY Country")]
+        country = st.selectbox("Country", countries)
+        history, projection = country_forecast(conn, dataset, country, model)
+
+    for frame in (history, projection):
+        frame["Series"] = frame["Gender"].astype(str) + " / " + frame["age_group"].astype(str)
+    past = alt.Chart(history).mark_line(point=True).encode(
+        x="Year:O",
+        y=alt.Y("estimate:Q", title="Mean estimate"),
+        color="Series:N",
+        tooltip=["Series", "Year", "estimate"]
+    )
+    future = alt.Chart(projection).encode(x="Year:O", color="Series:N")
+    band = future.mark_area(opacity=0.2).encode(y="lower:Q", y2="upper:Q")
+    line = future.mark_line(strokeDash=[4, 4]).encode(
+        y="forecast:Q",
+        tooltip=["Series", "Year", "forecast", "lower", "upper"]
+    )
+    st.altair_chart(past + band + line, use_container_width=True)
+    st.caption(f"{model} trend fitted per series; shaded: 95% interval")
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+
+from combined import plan
+from db_pool import get_pool
+from fetch import fetch_frame
+from result_cache import read_data_version
+from rollups import route
+from schema import SQL_TYPES, TABLE_COLUMNS, TABLES
+from star_schema import is_star
+from trends import route_trends
+
+# ---------------- Query backends for the catalog ----------------
+# queries.py and app.py run catalog queries through a backend: backend.query(name, sql, params) -> DataFrame,
+# and backend.data_version() changes whenever the data behind it is reloaded (result_cache.py).
+#   sqlite -> nutrition.db through the process-wide read-only pool (db_pool.py), with the
+#             combined-query plans (combined.py), trend plans (trends.py) and rollup routing (rollups.py)
+#   duckdb -> embedded columnar engine reading the verified Parquet files directly (CSV if that is
+#             all there is), i.e. the same frames database.py loads into nutrition.db
+# NUTRITION_BACKEND picks the default; duckdb is optional and only needed when selected.
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+DB_PATH = "nutrition.db"
+DEFAULT_BACKEND = os.environ.get("NUTRITION_BACKEND", "sqlite")
+
+# table -> storage.py frame name it is loaded from
+FRAMES = {table: f"df_{table}_clean_verified" for table in TABLES}
+# schema.SQL_TYPES (SQLite affinities) -> DuckDB types
+DUCKDB_TYPES = {"TEXT": "VARCHAR", "INTEGER": "BIGINT", "REAL": "DOUBLE"}
+
+
+class SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, path=DB_PATH):
+        self.pool = get_pool(path)
+
+    # keyset pages (paging.py) on the rowid; a --star load (star_schema.py) leaves views, whose
+    # rowid is NULL. Checked on every use, since the backend outlives reloads (app.py keeps one)
+    @property
+    def row_key(self):
+        with self.pool.reader() as conn:
+            return None if is_star(conn) else "rowid"
+
+    def query(self, name, sql, params=None):
+        with self.pool.reader() as conn:
+            return fetch_frame(conn.execute(route(conn, route_trends(conn, name, plan(name, sql))), params or ()))
+
+    def data_version(self):
+        with self.pool.reader() as conn:
+            return read_data_version(conn)
+
+    # the connections stay open in the pool for the next rerun
+    def close(self):
+        pass
+
+
+class DuckDBBackend:
+    name = "duckdb"
+
+    # materialize=True copies the files into DuckDB's in-memory column store once, instead of
+    # scanning them on every query
+    def __init__(self, frames=FRAMES, materialize=False, tables=TABLES):
+        if not HAS_DUCKDB:
+            raise ImportError("the duckdb backend needs the duckdb package (pip install duckdb)")
+        self.conn = duckdb.connect()
+        kind = "TABLE" if materialize else "VIEW"
+        self.row_key = "rowid" if materialize else None   # views over files have no row ids
+        self.paths = []
+        for table, frame in frames.items():
+            if os.path.exists(f"{frame}.parquet"):
+                self.paths.append(f"{frame}.parquet")
+                source = f"read_parquet('{frame}.parquet')"
+            else:
+                self.paths.append(f"{frame}.csv")
+                source = f"read_csv_auto('{frame}.csv')"
+            # same columns in the same order as the nutrition.db table, which declares them all
+            # (files written before age_band existed get it as NULL there too)
+            present = {row[0] for row in self.conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+            cols = [c if c in present else f"CAST(NULL AS {DUCKDB_TYPES[SQL_TYPES.get(c, 'TEXT')]}) AS {c}"
+                    for c in TABLE_COLUMNS + [tables[table]]]
+            self.conn.execute(f"CREATE {kind} {table} AS SELECT {', '.join(cols)} FROM {source}")
+
+    # The combined-query plans are plain SQL and pay off here too: the catalog's joins on Gender or
+    # Year + age_group would otherwise still materialize hundreds of millions of joined rows.
+    # Each query runs on its own cursor: app.py shares one backend between sessions (threads), and
+    # a DuckDB connection must not be used from two threads at once
+    def query(self, name, sql, params=None):
+        with self.conn.cursor() as cursor:
+            return cursor.execute(plan(name, sql), params).df()
+
+    # the files are rewritten on every pipeline run
+    def data_version(self):
+        return tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in self.paths)
+
+    def close(self):
+        self.conn.close()
+
+
+BACKENDS = {"sqlite": SQLiteBackend, "duckdb": DuckDBBackend}
+
+
+def open_backend(name=DEFAULT_BACKEND, **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
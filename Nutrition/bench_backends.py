@@ -0,0 +1,69 @@
+import re
+import sys
+import time
+
+import pandas as pd
+from backends import HAS_DUCKDB, DuckDBBackend, SQLiteBackend
+from queries import queries
+
+# Per-query latency of the catalog on each backend, side by side (median of REPEAT runs, ms).
+# duckdb scans the Parquet files per query; duckdb-mem loads them into memory once (its setup time
+# is printed separately). Every result is checked against sqlite; queries without ORDER BY are
+# compared as sets of rows, since engines may return groups in any order.
+# Run next to nutrition.db (database.py) and the verified frames; pass a repeat count to change it.
+REPEAT = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+setups = {"sqlite": SQLiteBackend}
+if HAS_DUCKDB:
+    setups["duckdb"] = DuckDBBackend
+    setups["duckdb-mem"] = lambda: DuckDBBackend(materialize=True)
+else:
+    print("duckdb is not installed, timing sqlite only")
+
+
+def same(expected, actual, sql):
+    # missing values arrive as None from sqlite and as NaN from duckdb's typed columns
+    expected, actual = (df.astype(object).where(df.notna(), None) for df in (expected, actual))
+    if not re.search(r"\bORDER\s+BY\b", sql, re.IGNORECASE):
+        expected = expected.sort_values(list(expected.columns), ignore_index=True)
+        actual = actual.sort_values(list(actual.columns), ignore_index=True)
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_dtype=False, rtol=1e-6)
+        return True
+    except AssertionError:
+        return False
+
+
+backends = {}
+for label, setup in setups.items():
+    start = time.perf_counter()
+    backends[label] = setup()
+    print(f"{label} setup: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+timings = {label: {} for label in backends}
+mismatches = []
+for name, sql in queries.items():
+    expected = None
+    for label, backend in backends.items():
+        runs = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            df = backend.query(name, sql)
+            runs.append(time.perf_counter() - start)
+        timings[label][name] = sorted(runs)[len(runs) // 2] * 1000
+        if expected is None:
+            expected = df
+        elif not same(expected, df, sql):
+            mismatches.append(f"{label}: {name}")
+
+print(f"\n{'query':<60}" + "".join(f"{label + ' ms':>14}" for label in backends))
+for name in queries:
+    print(f"{name[:60]:<60}" + "".join(f"{timings[label][name]:>14.2f}" for label in backends))
+print(f"{'total':<60}" + "".join(f"{sum(timings[label].values()):>14.2f}" for label in backends))
+
+for backend in backends.values():
+    backend.close()
+if mismatches:
+    print("\nResults differ from sqlite:\n  " + "\n  ".join(mismatches))
+    sys.exit(1)
+print("\nAll results match sqlite.")
@@ -0,0 +1,75 @@
+import sqlite3
+import sys
+import time
+
+import numpy as np
+from forecast import GRID, HORIZON, MIN_YEARS, _fit_chunked, fit_damped, fit_linear, load_series, pack
+
+# Series/sec of forecast.py's batched fits against fitting one series at a time in Python, on the
+# malnutrition series of nutrition.db replicated N times (each copy scaled by lognormal noise, as
+# synthetic.py does). The per-series loops run on a sample and must give the same projections.
+# python bench_forecast.py [COPIES...]   (default 1 10 100)
+COPIES = [int(s) for s in sys.argv[1:]] or [1, 10, 100]
+SAMPLE = 300
+
+conn = sqlite3.connect("nutrition.db")
+keys, years, base = pack(load_series(conn, "malnutrition"))
+conn.close()
+base = base[(~np.isnan(base)).sum(1) >= MIN_YEARS]
+target = np.arange(years[-1] + 1, HORIZON + 1)
+
+
+def loop_linear(years, Y, target):
+    mean, se = np.empty((len(Y), len(target))), np.empty((len(Y), len(target)))
+    center, x0 = years.mean(), target - years.mean()
+    for i, row in enumerate(Y):
+        ok = ~np.isnan(row)
+        x, y = years[ok] - center, row[ok]
+        slope, intercept = np.polyfit(x, y, 1)
+        sigma = np.sqrt(((y - intercept - slope * x) ** 2).sum() / (len(y) - 2))
+        leverage = 1 / len(x) + (x0 - x.mean()) ** 2 / ((x - x.mean()) ** 2).sum()
+        mean[i], se[i] = intercept + slope * x0, sigma * np.sqrt(1 + leverage)
+    return mean, se
+
+
+def loop_damped(years, Y, target):
+    mean, se = np.empty((len(Y), len(target))), np.empty((len(Y), len(target)))
+    for i, row in enumerate(Y):
+        ok = ~np.isnan(row)
+        idx = np.flatnonzero(ok)
+        slope = np.polyfit(years[ok] - years.mean(), row[ok], 1)[0]
+        best = None
+        for alpha, beta, phi in GRID:
+            level, trend, sse = row[idx[0]], slope, 0.0
+            for t in range(idx[0] + 1, len(row)):
+                predicted = level + phi * trend
+                error = row[t] - predicted if ok[t] else 0.0
+                level, trend, sse = predicted + alpha * error, phi * trend + beta * error, sse + error ** 2
+            if best is None or sse < best[0]:
+                best = (sse, level, trend, alpha, beta, phi)
+        sse, level, trend, alpha, beta, phi = best
+        sigma = np.sqrt(sse / (len(idx) - 1))
+        for k, year in enumerate(target):
+            ahead = year - years[-1]
+            steps = len(row) - 1 - idx[-1] + ahead
+            mean[i, k] = level + phi * (1 - phi ** ahead) / (1 - phi) * trend
+            c = [alpha + beta * phi * (1 - phi ** j) / (1 - phi) for j in range(1, steps)]
+            se[i, k] = sigma * np.sqrt(1 + sum(v * v for v in c))
+    return mean, se
+
+
+def series_per_second(fit, Y):
+    start = time.perf_counter()
+    result = fit(years, Y, target)
+    return len(Y) / (time.perf_counter() - start), result
+
+
+rng = np.random.default_rng(0)
+print(f"{'copies':>6} {'series':>8} {'model':<7} {'batched series/s':>17} {'loop series/s':>14} {'speedup':>8}")
+for n in COPIES:
+    Y = np.concatenate([base * np.exp(rng.normal(0, 0.03, base.shape)) if i else base for i in range(n)])
+    for model, batched, loop in (("linear", fit_linear, loop_linear), ("damped", fit_damped, loop_damped)):
+        fast, (mean, se) = series_per_second(lambda y, Y, t: _fit_chunked(batched, y, Y, t), Y)
+        slow, (loop_mean, loop_se) = series_per_second(loop, Y[:SAMPLE])
+        assert np.allclose(mean[:SAMPLE], loop_mean) and np.allclose(se[:SAMPLE], loop_se), model
+        print(f"{n:>5}x {len(Y):>8} {model:<7} {fast:>17,.0f} {slow:>14,.0f} {fast / slow:>7.0f}x")
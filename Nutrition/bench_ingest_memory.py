@@ -0,0 +1,83 @@
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from gho_stream import iter_file_chunks, read_frame
+
+# Peak memory of today's ingest (.json() + DataFrame per indicator) vs the streaming parser,
+# on canned GHO-shaped payloads written to disk so no network is needed.
+
+COLS = ["ParentLocation", "Dim1", "TimeDim", "Low", "High", "NumericValue", "SpatialDim"]
+COUNTRIES = 200
+SEXES = ["SEX_MLE", "SEX_FMLE", "SEX_BTSX"]
+REGIONS = ["Africa", "Americas", "Europe", "Eastern Mediterranean", "South-East Asia", "Western Pacific"]
+
+
+# ---------------- Canned GHO payload ----------------
+def write_payload(path, code, first_year, last_year):
+    rnd = random.Random(code)
+    records = []
+    for c in range(COUNTRIES):
+        for sex in SEXES:
+            for year in range(first_year, last_year + 1):
+                v = rnd.uniform(1, 40)
+                records.append({
+                    "Id": len(records), "IndicatorCode": code, "SpatialDimType": "COUNTRY",
+                    "SpatialDim": f"C{c:03d}", "TimeDimType": "YEAR", "ParentLocationCode": "R",
+                    "ParentLocation": REGIONS[c % len(REGIONS)], "Dim1Type": "SEX", "Dim1": sex,
+                    "TimeDim": year, "Dim2Type": None, "Dim2": None, "Dim3Type": None, "Dim3": None,
+                    "DataSourceDimType": None, "DataSourceDim": None,
+                    "Value": f"{v:.1f} [{v - 1:.1f}-{v + 1:.1f}]", "NumericValue": v,
+                    "Low": v - 1, "High": v + 1, "Comments": None, "Date": "2024-02-20T10:00:00+01:00",
+                    "TimeDimensionValue": str(year), "TimeDimensionBegin": f"{year}-01-01T00:00:00+01:00",
+                    "TimeDimensionEnd": f"{year}-12-31T00:00:00+01:00",
+                })
+    with open(path, "w") as f:
+        json.dump({"@odata.context": "https://ghoapi.azureedge.net/api/$metadata", "value": records}, f)
+
+
+# ---------------- The two ingest paths ----------------
+def ingest_current(paths):
+    data = {}
+    for name, path in paths.items():
+        with open(path, "rb") as f:
+            data[name] = json.loads(f.read())
+    frames = {name: pd.DataFrame(data[name]["value"]) for name in data}
+    return {name: df[COLS] for name, df in frames.items()}
+
+
+def ingest_streaming(paths):
+    return {name: read_frame(iter_file_chunks(path), COLS) for name, path in paths.items()}
+
+
+def measure(ingest, paths):
+    tracemalloc.start()
+    start = time.perf_counter()
+    frames = ingest(paths)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = sum(len(df) for df in frames.values())
+    return rows, peak, seconds
+
+
+if __name__ == "__main__":
+    print(f"{'indicators':>10} {'years':>6} {'payload MB':>10} {'rows':>8} "
+          f"{'current MB':>10} {'stream MB':>10} {'current s':>9} {'stream s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_indicators in (1, 2, 4, 8):
+            for first_year in (2012, 1975):
+                paths = {}
+                for i in range(n_indicators):
+                    paths[f"IND_{i}"] = os.path.join(tmp, f"IND_{i}_{first_year}.json")
+                    if not os.path.exists(paths[f"IND_{i}"]):
+                        write_payload(paths[f"IND_{i}"], f"IND_{i}", first_year, 2022)
+                payload_mb = sum(os.path.getsize(p) for p in paths.values()) / 1e6
+                rows, peak_current, s_current = measure(ingest_current, paths)
+                _, peak_stream, s_stream = measure(ingest_streaming, paths)
+                print(f"{n_indicators:>10} {2022 - first_year + 1:>6} {payload_mb:>10.1f} {rows:>8} "
+                      f"{peak_current / 1e6:>10.1f} {peak_stream / 1e6:>10.1f} {s_current:>9.2f} {s_stream:>8.2f}")
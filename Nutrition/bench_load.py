@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from indexes import create_indexes
+from loader import bulk_load
+from storage import read_frame
+
+# Rows/sec loading the obesity table: the old to_sql(if_exists='replace') path vs loader.bulk_load,
+# at 1x, 10x and 100x the current table. Each copy gets its own Country suffix so rows stay distinct.
+# Both paths build the catalog indexes afterwards, like database.py. Both are executemany in one
+# transaction, so expect parity (~1x); the index build is most of the time.
+SCALES = [int(s) for s in sys.argv[1:]] or [1, 10, 100]
+
+base = read_frame("df_obesity_clean_verified", downcast_floats=False)
+
+
+def scaled(n):
+    if n == 1:
+        return base
+    copies = [base.assign(Country=base['Country'].astype(str) + f" #{i}") for i in range(n)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def to_sql_load(conn, df):
+    df.to_sql("obesity", conn, if_exists='replace', index=False)
+
+
+def bulk(conn, df):
+    bulk_load(conn, "obesity", df)
+
+
+def timed(load, df):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        start = time.perf_counter()
+        load(conn, df)
+        loaded = time.perf_counter() - start
+        create_indexes(conn, {"obesity": "obesity_level"})
+        total = time.perf_counter() - start
+        conn.close()
+    return loaded, total
+
+
+print(f"{'scale':>6} {'rows':>10} {'path':<10} {'load s':>8} {'rows/s':>10} {'+indexes s':>11} {'rows/s':>10}")
+for n in SCALES:
+    df = scaled(n)
+    results = {}
+    for label, load in (("to_sql", to_sql_load), ("bulk", bulk)):
+        loaded, total = timed(load, df)
+        results[label] = total
+        print(f"{n:>5}x {len(df):>10} {label:<10} {loaded:>8.2f} {len(df) / loaded:>10.0f} "
+              f"{total:>11.2f} {len(df) / total:>10.0f}")
+    print(f"{'':>17} speedup incl. indexes: {results['to_sql'] / results['bulk']:.2f}x")
@@ -0,0 +1,29 @@
+import time
+
+from gho_client import fetch_all
+from indicators import INDICATORS, indicator_params, indicator_urls
+
+# Bytes on the wire for the full indicator history vs the OData $filter/$select request.
+# Runs against GHO_API_BASE (the live API by default) without the response cache.
+
+urls = indicator_urls(INDICATORS)
+
+runs = {}
+for label, params in (("full", None), ("pushdown", indicator_params(INDICATORS))):
+    start = time.perf_counter()
+    data, stats = fetch_all(urls, params)
+    runs[label] = {
+        "wall": time.perf_counter() - start,
+        "bytes": {s["indicator"]: s["bytes"] for s in stats},
+        "rows": {name: len(payload["value"]) for name, payload in data.items()},
+    }
+
+print(f"{'indicator':<24} {'full KB':>10} {'pushdown KB':>12} {'ratio':>7} {'full rows':>10} {'pushdown rows':>14}")
+for name in urls:
+    full, pushed = runs["full"]["bytes"][name], runs["pushdown"]["bytes"][name]
+    print(f"{name:<24} {full / 1024:>10.1f} {pushed / 1024:>12.1f} {full / max(pushed, 1):>6.1f}x "
+          f"{runs['full']['rows'][name]:>10} {runs['pushdown']['rows'][name]:>14}")
+total_full = sum(runs["full"]["bytes"].values())
+total_pushed = sum(runs["pushdown"]["bytes"].values())
+print(f"{'total':<24} {total_full / 1024:>10.1f} {total_pushed / 1024:>12.1f} {total_full / max(total_pushed, 1):>6.1f}x")
+print(f"wall time: full {runs['full']['wall']:.2f}s, pushdown {runs['pushdown']['wall']:.2f}s")
@@ -0,0 +1,156 @@
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from backends import FRAMES, HAS_DUCKDB, DuckDBBackend, SQLiteBackend
+from queries import queries
+from synthetic import generate
+
+# ---------------- Benchmark suite on synthetic data at several scales ----------------
+# python bench_suite.py [SCALES...] [--repeat N] [--out FILE] [--compare OLD.json]
+# For each scale (default 10 and 100; 1000 on request) in bench_data/x<scale>/:
+#   generate  synthetic.py copies of the verified frames in the current directory
+#   load      database.py run as-is in that directory (tables, indexes, rollups), wall time
+#   queries   every catalog query on each backend, median of --repeat runs (ms)
+#   dashboard app.py under Streamlit's AppTest: first run, then one rerun per catalog query (ms)
+# Results go to bench_results/<timestamp>.json; --compare prints ratios against an earlier file.
+HERE = os.path.dirname(os.path.abspath(__file__))
+OPTIONS = {"--repeat": 3, "--out": "", "--compare": ""}
+
+
+def _parse(argv):
+    options, scales = dict(OPTIONS), []
+    args = iter(argv)
+    for arg in args:
+        if arg in options:
+            options[arg] = type(OPTIONS[arg])(next(args))
+        else:
+            scales.append(int(arg))
+    return scales or [10, 100], options
+
+
+def _median_ms(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return round(sorted(runs)[len(runs) // 2] * 1000, 3)
+
+
+def bench_load(workdir):
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.join(HERE, "database.py")], cwd=workdir, env=env,
+                          capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if proc.returncode:
+        raise RuntimeError(f"database.py failed in {workdir}:\n{proc.stderr}")
+    return round(seconds, 3)
+
+
+def bench_queries(workdir, repeat):
+    backends = {"sqlite": lambda: SQLiteBackend(os.path.join(workdir, "nutrition.db"))}
+    if HAS_DUCKDB:
+        frames = {table: os.path.join(workdir, frame) for table, frame in FRAMES.items()}
+        backends["duckdb"] = lambda: DuckDBBackend(frames)
+        backends["duckdb-mem"] = lambda: DuckDBBackend(frames, materialize=True)
+    results = {}
+    for label, setup in backends.items():
+        start = time.perf_counter()
+        backend = setup()
+        timings = {"_setup": round((time.perf_counter() - start) * 1000, 3)}
+        for name, sql in queries.items():
+            timings[name] = _median_ms(lambda: backend.query(name, sql), repeat)
+        backend.close()
+        results[label] = timings
+    return results
+
+
+# Server-side render time of the dashboard per query (query, conversion, chart spec, elements)
+def bench_dashboard(workdir):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {"_skipped": "streamlit is not installed"}
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        app = AppTest.from_file(os.path.join(HERE, "app.py"), default_timeout=600)
+        start = time.perf_counter()
+        app.run()
+        results = {"_first_run": round((time.perf_counter() - start) * 1000, 3)}
+        for name in queries:
+            start = time.perf_counter()
+            app.selectbox[0].select(name).run()
+            elapsed = round((time.perf_counter() - start) * 1000, 3)
+            results[name] = {"error": str(app.exception[0].message)} if app.exception else elapsed
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+def table_rows(workdir):
+    conn = sqlite3.connect(os.path.join(workdir, "nutrition.db"))
+    rows = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in FRAMES}
+    conn.close()
+    return rows
+
+
+def _totals(scale_result):
+    totals = {f"queries:{label}": sum(v for k, v in timings.items() if not k.startswith("_"))
+              for label, timings in scale_result["queries"].items()}
+    totals["load"] = scale_result["load_s"] * 1000
+    dashboard = [v for k, v in scale_result["dashboard"].items() if isinstance(v, (int, float)) and k != "_first_run"]
+    if dashboard:
+        totals["dashboard"] = sum(dashboard)
+    return totals
+
+
+def print_summary(results, previous=None):
+    print(f"\n{'scale':>6} {'metric':<22} {'total ms':>12}" + (f" {'previous':>12} {'ratio':>7}" if previous else ""))
+    for scale, scale_result in results["scales"].items():
+        old = _totals(previous["scales"][scale]) if previous and scale in previous["scales"] else {}
+        for metric, ms in _totals(scale_result).items():
+            line = f"{scale + 'x':>6} {metric:<22} {ms:>12.1f}"
+            if metric in old:
+                line += f" {old[metric]:>12.1f} {ms / old[metric]:>6.2f}x"
+            print(line)
+        failed = [k for k, v in scale_result["dashboard"].items() if isinstance(v, dict)]
+        if failed:
+            print(f"{scale + 'x':>6} dashboard failed on {len(failed)} queries (errors in the JSON)")
+
+
+if __name__ == "__main__":
+    scales, options = _parse(sys.argv[1:])
+    out = options["--out"] or os.path.join("bench_results", datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    results = {
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(), "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+        "cpus": os.cpu_count(), "repeat": options["--repeat"], "scales": {},
+    }
+    for scale in scales:
+        workdir = os.path.join("bench_data", f"x{scale}")
+        print(f"--- {scale}x in {workdir}")
+        result = {"generate_ms": _median_ms(lambda: generate(scale, workdir), 1)}
+        result["load_s"] = bench_load(workdir)
+        result["rows"] = table_rows(workdir)
+        print(f"    generated {result['generate_ms']:.0f} ms, loaded {result['rows']} in {result['load_s']:.1f} s")
+        result["queries"] = bench_queries(workdir, options["--repeat"])
+        result["dashboard"] = bench_dashboard(workdir)
+        results["scales"][str(scale)] = result
+
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    previous = None
+    if options["--compare"]:
+        with open(options["--compare"]) as f:
+            previous = json.load(f)
+    print_summary(results, previous)
+    print(f"\nResults written to {out}")
@@ -0,0 +1,21 @@
+import csv
+import pycountry
+
+# Builds country_codes.csv, the packaged GHO SpatialDim -> name lookup used by transforms.py.
+# Run again only when pycountry or the GHO aggregate codes change.
+
+SPECIAL_CASES = {
+    'GLOBAL': 'Global', 'WB_LMI': 'Low & Middle Income', 'WB_HI': 'High Income',
+    'WB_LI': 'Low Income', 'WB_UMI': 'Upper Middle Income', 'EMR': 'Eastern Mediterranean Region',
+    'EUR': 'Europe', 'AFR': 'Africa', 'SEAR': 'South-East Asia Region',
+    'WPR': 'Western Pacific Region', 'AMR': 'Americas Region'
+}
+
+rows = sorted((c.alpha_3, c.name) for c in pycountry.countries)
+rows += sorted(SPECIAL_CASES.items())
+
+with open("country_codes.csv", "w", newline="", encoding="utf-8") as f:
+    writer = csv.writer(f)
+    writer.writerow(["code", "name"])
+    writer.writerows(rows)
+print(f"country_codes.csv written with {len(rows)} codes (pycountry {pycountry.__version__})")
@@ -0,0 +1,99 @@
+import json
+import math
+import os
+import time
+
+import altair as alt
+from combined import plan
+
+# ---------------- Chart data planner for the dashboard ----------------
+# app.py charts every catalog result, and a result with thousands of rows (High CI_Width flags,
+# the female/male self-join, per-country queries at scale) used to go into the Vega spec row by
+# row. Results that fit in MAX_POINTS points are charted as they are; larger ones are reduced in
+# SQL by the backend, over the catalog query itself:
+#   bar charts  -> one bar per category (average), the TOP_N highest kept, the rest in one "Other" bar
+#   year charts -> one point per Year (average), binned into wider year ranges if there are too many
+# run(name, sql) executes the reduced query (app.py passes the result cache), so each reduction
+# is computed once per data version; the cache keys on the name, which names the reduction too. df may be a single page of the result (paging.py); rows is
+# then the full row count, and a result that fits is fetched whole through run.
+MAX_POINTS = int(os.environ.get("NUTRITION_CHART_POINTS", 1000))
+TOP_N = 30
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# The catalog query as CTE q with positional column names c0..cN (results can repeat a name)
+def _over(name, sql, columns):
+    inner = plan(name, sql).strip().rstrip(";")
+    names = ", ".join(f"c{i}" for i in range(len(columns)))
+    return f"WITH q({names}) AS (\n{inner}\n)"
+
+
+def top_n_sql(name, sql, columns, x, ys, n=TOP_N):
+    cx, cys = columns.index(x), [columns.index(y) for y in ys]
+    averages = ", ".join(f"AVG(c{i}) AS y{k}, COUNT(c{i}) AS n{k}" for k, i in enumerate(cys))
+    merged = ", ".join(f"SUM(y{k} * n{k}) / SUM(n{k}) AS {_quote(y)}" for k, y in enumerate(ys))
+    return f"""{_over(name, sql, columns)},
+g AS (SELECT c{cx} AS x, {averages}, COUNT(*) AS n FROM q GROUP BY c{cx}),
+r AS (SELECT *, ROW_NUMBER() OVER (ORDER BY y0 DESC) AS rank FROM g)
+SELECT CASE WHEN rank <= {n} THEN x ELSE 'Other (' || ((SELECT COUNT(*) FROM g) - {n}) || ')' END AS {_quote(x)},
+       {merged}, SUM(n) AS rows
+FROM r
+GROUP BY 1
+ORDER BY MIN(rank)"""
+
+
+def year_sql(name, sql, columns, ys, width=1):
+    cyear = columns.index("Year")
+    year = f"c{cyear}" if width == 1 else f"c{cyear} - c{cyear} % {width}"
+    select = [f'{year} AS "Year"'] + [f"AVG(c{columns.index(y)}) AS {_quote(y)}" for y in ys if y != "Year"]
+    return f"""{_over(name, sql, columns)}
+SELECT {", ".join(select)}, COUNT(*) AS rows
+FROM q
+WHERE c{cyear} IS NOT NULL
+GROUP BY 1
+ORDER BY 1"""
+
+
+def _whole(run, name, sql, df, rows):
+    return (df if len(df) == rows else run(name, sql)), {"rows": rows}
+
+
+def _reduce(run, name, reduced_sql, ys, rows, label):
+    start = time.perf_counter()
+    data = run(f"{name} [chart: {label} of {', '.join(ys)}]", reduced_sql)
+    return data, {"rows": rows, "reduced": label, "sql_seconds": time.perf_counter() - start}
+
+
+# Bar data: categories of x with the ys values, the whole result when rows * len(ys) fits
+def category_data(run, name, sql, df, x, ys, rows=None, n=TOP_N):
+    rows = len(df) if rows is None else rows
+    if rows * len(ys) <= MAX_POINTS:
+        return _whole(run, name, sql, df, rows)
+    return _reduce(run, name, top_n_sql(name, sql, list(df.columns), x, ys, n), ys, rows, f"top {n} {x} + Other")
+
+
+# Line data over Year for the ys, the whole result when it has at most MAX_POINTS rows
+def year_data(run, name, sql, df, ys, rows=None):
+    rows = len(df) if rows is None else rows
+    if rows <= MAX_POINTS:
+        return _whole(run, name, sql, df, rows)
+    data, info = _reduce(run, name, year_sql(name, sql, list(df.columns), ys), ys, rows, "average per Year")
+    if len(data) <= MAX_POINTS:
+        return data, info
+    width = math.ceil((int(data["Year"].max()) - int(data["Year"].min()) + 1) / MAX_POINTS)
+    return _reduce(run, name, year_sql(name, sql, list(df.columns), ys, width), ys, rows,
+                   f"average per {width} years")
+
+
+# Caption under a chart: points sent, how they were reduced, spec size and server-side render time
+def describe(info, charts, seconds):
+    points = sum(len(chart.data) for chart in charts)
+    with alt.data_transformers.disable_max_rows():
+        spec = sum(len(json.dumps(chart.to_dict())) for chart in charts)
+    text = f"{points:,} points"
+    if "reduced" in info:
+        text += f" from {info['rows']:,} rows ({info['reduced']}, in SQL {info['sql_seconds'] * 1000:.0f} ms)"
+    return f"{text} · spec {spec / 1024:.1f} KB · rendered in {seconds * 1000:.0f} ms"
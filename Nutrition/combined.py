@@ -0,0 +1,134 @@
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+# ---------------- Pre-aggregating builder for the combined (join) queries ----------------
+# The catalog's combined queries join raw rows on low-cardinality keys (Gender, Year + age_group, ...)
+# and aggregate afterwards, so every row meets every matching row of the other side. Here each side
+# is first reduced to one row per join key (row count n, sum, non-null count, min, max) and the
+# small results are joined. Over the raw join every row of one side is repeated once per matching
+# row of the other, so the aggregates are rebuilt with those multiplicities:
+#   AVG(o.x)  = SUM(o.sum_x * m.n) / SUM(o.cnt_x * m.n)
+#   SUM(o.x)  = SUM(o.sum_x * m.n)        COUNT(*) = SUM(o.n * m.n)
+#   MIN/MAX(o.x) = MIN/MAX(o.min_x / o.max_x) over the matched keys
+
+# Catalog name -> spec. sides: alias -> (table, WHERE on that side or None); on: join columns;
+# group_by: (alias, column, output name); measures: (output name, function, alias, column);
+# derived: output name -> expression over measure names in {braces}.
+COMBINED = {
+    "Countries where Female Obesity Exceeds Male (Large Margin)": {
+        "sides": {"f": ("obesity", "Gender = 'Female'"), "m": ("obesity", "Gender = 'Male'")},
+        "on": ["Country", "Year", "age_group"],
+        "group_by": [("f", "Country", "Country"), ("f", "Year", "Year"), ("f", "age_group", "age_group")],
+        "measures": [("Female_Obesity", "AVG", "f", "Mean_Estimate"), ("Male_Obesity", "AVG", "m", "Mean_Estimate")],
+        "derived": {"Difference": "({Female_Obesity} - {Male_Obesity})"},
+        "having": "Difference >= 5",
+        "order_by": "Difference DESC",
+    },
+    "Obesity vs malnutrition comparison by country": {
+        "sides": {"o": ("obesity", None), "m": ("malnutrition", None)},
+        "on": ["Country"],
+        "group_by": [("o", "Country", "Country")],
+        "measures": [("avg_obesity", "AVG", "o", "Mean_Estimate"), ("avg_malnutrition", "AVG", "m", "Mean_Estimate")],
+        "limit": 5,
+    },
+    "Gender-based disparity in both obesity and malnutrition": {
+        "sides": {"o": ("obesity", None), "m": ("malnutrition", None)},
+        "on": ["Gender"],
+        "group_by": [("o", "Gender", "Gender")],
+        "measures": [("avg_obesity", "AVG", "o", "Mean_Estimate"), ("avg_malnutrition", "AVG", "m", "Mean_Estimate")],
+    },
+    "Region-wise avg estimates side-by-side(Africa and America)": {
+        "sides": {"o": ("obesity", "Region IN ('Africa','Americas')"), "m": ("malnutrition", None)},
+        "on": ["Region"],
+        "group_by": [("o", "Region", "Region")],
+        "measures": [("avg_obesity", "AVG", "o", "Mean_Estimate"), ("avg_malnutrition", "AVG", "m", "Mean_Estimate")],
+    },
+    "Countries with obesity up & malnutrition down": {
+        "sides": {"o": ("obesity", None), "m": ("malnutrition", None)},
+        "on": ["Year", "age_group"],
+        "group_by": [("o", "age_group", "age_group"), ("o", "Year", "Year")],
+        "measures": [("avg_obesity", "AVG", "o", "Mean_Estimate"), ("avg_malnutrition", "AVG", "m", "Mean_Estimate")],
+        "order_by": "age_group, Year",
+    },
+    "Age-wise trend analysis": {
+        "sides": {"o": ("obesity", None), "m": ("malnutrition", None)},
+        "on": ["Country", "Year", "Gender", "age_group"],
+        "group_by": [("o", "Year", "Year"), ("o", "age_group", "age_group")],
+        "measures": [("Avg_Obesity", "AVG", "o", "Mean_Estimate"), ("Avg_Malnutrition", "AVG", "m", "Mean_Estimate")],
+        "order_by": "Year",
+    },
+}
+
+
+def _measure(func, side, other, col):
+    return {
+        "AVG": f"SUM({side}.sum_{col} * {other}.n) / SUM({side}.cnt_{col} * {other}.n)",
+        "SUM": f"SUM({side}.sum_{col} * {other}.n)",
+        "COUNT": f"SUM({side}.cnt_{col} * {other}.n)",
+        "MIN": f"MIN({side}.min_{col})",
+        "MAX": f"MAX({side}.max_{col})",
+    }[func]
+
+
+def build_sql(spec):
+    (a, _), (b, _) = spec["sides"].items()
+    other = {a: b, b: a}
+    ctes = []
+    for alias, (table, where) in spec["sides"].items():
+        # each side is grouped by the join keys plus any of its own GROUP BY columns
+        grain = list(spec["on"]) + [c for s, c, _ in spec["group_by"] if s == alias and c not in spec["on"]]
+        cols = sorted({col for _, _, s, col in spec["measures"] if s == alias})
+        aggs = ["COUNT(*) AS n"] + [f"SUM({c}) AS sum_{c}, COUNT({c}) AS cnt_{c}, MIN({c}) AS min_{c}, MAX({c}) AS max_{c}"
+                                    for c in cols]
+        ctes.append(f"{alias} AS (SELECT {', '.join(grain)}, {', '.join(aggs)} FROM {table}"
+                    f"{f' WHERE {where}' if where else ''} GROUP BY {', '.join(grain)})")
+
+    measures = {name: _measure(func, side, other[side], col) for name, func, side, col in spec["measures"]}
+    select = [f"{s}.{c} AS {name}" for s, c, name in spec["group_by"]]
+    select += [f"{expr} AS {name}" for name, expr in measures.items()]
+    select += [f"{expr.format(**measures)} AS {name}" for name, expr in spec.get("derived", {}).items()]
+    sql = (f"WITH {', '.join(ctes)} SELECT {', '.join(select)} FROM {a} JOIN {b} ON "
+           + " AND ".join(f"{a}.{c} = {b}.{c}" for c in spec["on"])
+           + f" GROUP BY {', '.join(f'{s}.{c}' for s, c, _ in spec['group_by'])}")
+    if spec.get("having"):
+        sql += f" HAVING {spec['having']}"
+    # without an ORDER BY the original returns groups in GROUP BY order; make that explicit
+    sql += f" ORDER BY {spec.get('order_by') or ', '.join(name for _, _, name in spec['group_by'])}"
+    if spec.get("limit"):
+        sql += f" LIMIT {spec['limit']}"
+    return sql
+
+
+# Catalog SQL for name, replaced by the pre-aggregating version for the combined queries
+def plan(name, sql):
+    spec = COMBINED.get(name)
+    return build_sql(spec) if spec else sql
+
+
+# ---------------- Proof: builder output vs the catalog SQL ----------------
+# python combined.py [db] runs both versions of every combined query and compares the results
+if __name__ == "__main__":
+    from queries import queries
+
+    conn = sqlite3.connect(sys.argv[1] if len(sys.argv) > 1 else "nutrition.db")
+    failures = 0
+    print(f"{'query':<60} {'rows':>6} {'catalog s':>10} {'built s':>9}  result")
+    for name in COMBINED:
+        start = time.perf_counter()
+        expected = pd.read_sql_query(queries[name], conn)
+        catalog_s = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = pd.read_sql_query(plan(name, queries[name]), conn)
+        built_s = time.perf_counter() - start
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False, rtol=1e-9)
+            result = "match"
+        except AssertionError as e:
+            failures += 1
+            result = f"MISMATCH\n{e}"
+        print(f"{name[:60]:<60} {len(expected):>6} {catalog_s:>10.3f} {built_s:>9.4f}  {result}")
+    conn.close()
+    sys.exit(1 if failures else 0)
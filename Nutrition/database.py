@@ -1,32 +1,59 @@
 import sqlite3
-import pandas as pd
+import sys
+from forecast import rebuild_forecasts
+from indexes import create_indexes
+from loader import bulk_load
+from result_cache import bump_data_version
+from rollups import build_rollups
+from schema import TABLE_COLUMNS, print_memory_report
+from star_schema import build_star, drop_star
+from storage import read_frame
+from transforms import NATURAL_KEY
+from trends import build_trends
+
+# --star stores the data as integer-keyed dimension and fact tables behind obesity/malnutrition views
+STAR = "--star" in sys.argv
 
 # Connect DB
 conn = sqlite3.connect("nutrition.db")
 
-# Create tables
-conn.execute("""
-CREATE TABLE IF NOT EXISTS obesity(
-    Year INTEGER, Gender TEXT, Mean_Estimate REAL, LowerBound REAL,
-    UpperBound REAL, age_group TEXT, Country TEXT, Region TEXT,
-    CI_Width REAL, obesity_level TEXT
-)
-""")
-conn.execute("""
-CREATE TABLE IF NOT EXISTS malnutrition(
-    Year INTEGER, Gender TEXT, Mean_Estimate REAL, LowerBound REAL,
-    UpperBound REAL, age_group TEXT, Country TEXT, Region TEXT,
-    CI_Width REAL, malnutrition_level TEXT
-)
-""")
-
-# Insert data
-df_obesity = pd.read_csv("df_obesity_clean_verified.csv")
-df_malnutrition = pd.read_csv("df_malnutrition_clean_verified.csv")
-
-df_obesity.to_sql("obesity", conn, if_exists='replace', index=False)
-df_malnutrition.to_sql("malnutrition", conn, if_exists='replace', index=False)
+# Insert data (only the table columns are read)
+df_obesity = read_frame("df_obesity_clean_verified", TABLE_COLUMNS + ["obesity_level"], downcast_floats=False)
+df_malnutrition = read_frame("df_malnutrition_clean_verified", TABLE_COLUMNS + ["malnutrition_level"],
+                             downcast_floats=False)
+print_memory_report({"obesity": df_obesity, "malnutrition": df_malnutrition})
+
+# Tables are recreated with the column types from schema.py and loaded in one transaction each;
+# all indexes are built afterwards
+for table, df in (("obesity", df_obesity), ("malnutrition", df_malnutrition)):
+    print(f"{table}: {bulk_load(conn, table, df)} rows loaded")
+
+if STAR:
+    print(f"Star layout: fact rows {build_star(conn)}, obesity/malnutrition are now views")
+else:
+    drop_star(conn)
+    # Natural key for refresh_data.py upserts (CSVs written before age_band existed cannot carry one)
+    for table, df in (("obesity", df_obesity), ("malnutrition", df_malnutrition)):
+        if 'age_band' in df.columns:
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_key ON {table}({', '.join(NATURAL_KEY)})")
+        else:
+            print(f"{table}: no age_band column, rerun get_data.py before using refresh_data.py")
+
+    # Indexes for the query catalog (indexes.py; run it to check every query's plan)
+    create_indexes(conn)
+
+# Pre-aggregated rollups for the catalog's GROUP BY queries (rollups.route picks one per query)
+print("Rollups:", build_rollups(conn))
+
+# Year-over-year deltas, slopes and directions per Country x Gender x age_group series (trends.py)
+print("Trends:", build_trends(conn))
+
+# Series projections refitted on the new data (forecast.py; same horizon and models as before)
+print("Forecasts:", rebuild_forecasts(conn))
+
+# New data version: cached dashboard results of the previous load are no longer served
+print("Data version:", bump_data_version(conn))
 
 conn.commit()
 conn.close()
-print("SQLite DB ready with data!")
\ No newline at end of file
+print("SQLite DB ready with data!")
@@ -1,12 +1,15 @@
-import pandas as pd
+from schema import print_memory_report
+from storage import read_frame
 
 print("\n====== STEP 1: LOAD DATA ======\n")
 
-obesity_df = pd.read_csv("df_obesity_clean.csv")
-malnutrition_df = pd.read_csv("df_malnutrition_clean.csv")
+# Every column: step 2 reports missing values per column
+obesity_df = read_frame("df_obesity_clean")
+malnutrition_df = read_frame("df_malnutrition_clean")
 
 print("Obesity Shape:", obesity_df.shape)
 print("Malnutrition Shape:", malnutrition_df.shape)
+print_memory_report({"obesity": obesity_df, "malnutrition": malnutrition_df})
 
 
 print("\n====== STEP 2: CHECK MISSING VALUES ======\n")
@@ -1,11 +1,15 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
+from schema import print_memory_report
+from storage import read_frame, write_frame
 
 print("\n====== STEP 1: LOAD CLEANED DATA ======\n")
 
-obesity_df = pd.read_csv("df_obesity_clean.csv")
-malnutrition_df = pd.read_csv("df_malnutrition_clean.csv")
+# Full-precision estimates and every column: these frames are saved again as the *_verified files
+obesity_df = read_frame("df_obesity_clean", downcast_floats=False)
+malnutrition_df = read_frame("df_malnutrition_clean", downcast_floats=False)
+print_memory_report({"obesity": obesity_df, "malnutrition": malnutrition_df})
 
 
 print("\n====== STEP 2: MISSING REGION CHECK ======\n")
@@ -16,8 +20,8 @@ print("Before Fix — Malnutrition Missing Regions:", malnutrition_df['Region'].
 
 print("\n====== STEP 3: APPLY REGION FIX ======\n")
 
-obesity_df['Region'].fillna('Unknown', inplace=True)
-malnutrition_df['Region'].fillna('Unknown', inplace=True)
+obesity_df['Region'] = obesity_df['Region'].astype(object).fillna('Unknown')
+malnutrition_df['Region'] = malnutrition_df['Region'].astype(object).fillna('Unknown')
 
 print("After Fix — Obesity Missing Regions:", obesity_df['Region'].isna().sum())
 print("After Fix — Malnutrition Missing Regions:", malnutrition_df['Region'].isna().sum())
@@ -69,7 +73,8 @@ plt.show()
 
 print("\n====== STEP 7: SAVE FINAL CLEAN FILES ======\n")
 
-obesity_df.to_csv("df_obesity_clean_verified.csv", index=False)
-malnutrition_df.to_csv("df_malnutrition_clean_verified.csv", index=False)
+# --csv also exports the verified files as CSV
+write_frame(obesity_df, "df_obesity_clean_verified", csv="--csv" in sys.argv)
+write_frame(malnutrition_df, "df_malnutrition_clean_verified", csv="--csv" in sys.argv)
 
 print("🎉 Final validated datasets saved successfully")
\ No newline at end of file
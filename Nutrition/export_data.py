@@ -1,12 +1,15 @@
 import sqlite3
-import pandas as pd
+import sys
+from fetch import fetch_frame
+from storage import write_frame
 
 conn = sqlite3.connect("nutrition.db")
 
-obesity_df = pd.read_sql_query("SELECT * FROM obesity", conn)
-malnutrition_df = pd.read_sql_query("SELECT * FROM malnutrition", conn)
+obesity_df = fetch_frame(conn.execute("SELECT * FROM obesity"))
+malnutrition_df = fetch_frame(conn.execute("SELECT * FROM malnutrition"))
 
-obesity_df.to_csv("obesity.csv", index=False)
-malnutrition_df.to_csv("malnutrition.csv", index=False)
+# Parquet by default; pass --csv to also write obesity.csv / malnutrition.csv
+write_frame(obesity_df, "obesity", csv="--csv" in sys.argv)
+write_frame(malnutrition_df, "malnutrition", csv="--csv" in sys.argv)
 
 conn.close()
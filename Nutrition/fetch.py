@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from schema import CATEGORICAL_COLUMNS, INTEGER_COLUMNS, SQL_TYPES
+from storage import HAS_PARQUET
+
+if HAS_PARQUET:
+    import pyarrow as pa
+
+# ---------------- Typed columnar fetch from a SQLite cursor ----------------
+# Replaces pd.read_sql_query for catalog results and exports. Rows are pulled in batches of
+# BATCH_ROWS and each batch is turned straight into one typed array per column, so (with pyarrow)
+# no per-row objects outlive their batch, and the frame needs no dtype sniffing afterwards:
+#   schema columns (schema.SQL_TYPES) -> their declared type: text as categorical/dictionary,
+#                                        Year as int16 (float64 if it has NULLs), estimates as float64
+#   anything else (aggregates, aliases) -> inferred from the values (int64, float64 or string)
+# Arrow batches are used when pyarrow is installed (concatenated once at the end); without it the
+# values are collected per column and converted to NumPy arrays once.
+BATCH_ROWS = 50_000
+_SCHEMA = {name.lower(): name for name in SQL_TYPES}
+
+
+def _known(name):
+    return _SCHEMA.get(name.lower())
+
+
+def _arrow_type(column):
+    if column in CATEGORICAL_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if column in INTEGER_COLUMNS:
+        return pa.from_numpy_dtype(np.dtype(INTEGER_COLUMNS[column]))
+    return pa.float64()
+
+
+def _arrow_array(values, name):
+    column = _known(name)
+    if column is not None:
+        try:
+            return pa.array(values, type=_arrow_type(column))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            pass   # an alias that reuses a schema name for other values
+    return pa.array(values)
+
+
+def _numpy_column(values, name):
+    column = _known(name)
+    if column in CATEGORICAL_COLUMNS:
+        return pd.Categorical(values)
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, (int, float)) for v in present):
+        if all(isinstance(v, int) for v in present) and len(present) == len(values):
+            return np.array(values, dtype=INTEGER_COLUMNS.get(column, "int64"))
+        return np.array(values, dtype="float64")
+    return np.array(values, dtype=object)
+
+
+# cursor: an executed sqlite3 cursor. max_rows caps the rows fetched; the rest stay in the cursor.
+def fetch_frame(cursor, max_rows=None, batch_rows=BATCH_ROWS):
+    names = [d[0] for d in cursor.description]
+    batches = []
+    values = [[] for _ in names]   # NumPy fallback: per-column values, converted once at the end
+    fetched = 0
+    while max_rows is None or fetched < max_rows:
+        rows = cursor.fetchmany(batch_rows if max_rows is None else min(batch_rows, max_rows - fetched))
+        if not rows:
+            break
+        fetched += len(rows)
+        columns = zip(*rows)
+        if HAS_PARQUET:
+            # positional names: a result may repeat a column name (SELECT o.Country, m.Country)
+            batches.append(pa.table([_arrow_array(col, name) for col, name in zip(columns, names)],
+                                    names=[f"c{i}" for i in range(len(names))]))
+        else:
+            for column_values, col in zip(values, columns):
+                column_values.extend(col)
+
+    if not fetched:
+        return pd.DataFrame(columns=names)
+    if HAS_PARQUET:
+        # columns inferred per batch can differ (int64 then float64, null then string); permissive
+        # promotion widens them once here
+        df = pa.concat_tables(batches, promote_options="permissive").to_pandas()
+        # categories in lexical order, as apply_schema gives them (pandas sorts by category order)
+        for col in df.select_dtypes("category"):
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    else:
+        df = pd.DataFrame({i: _numpy_column(col, name) for i, (col, name) in enumerate(zip(values, names))})
+    df.columns = names
+    return df
@@ -0,0 +1,211 @@
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from fetch import fetch_frame
+from schema import TABLES
+from trends import SERIES, has_trends
+
+# ---------------- Batched series projections ----------------
+# python forecast.py [--to YEAR] [--model linear|damped|both] [--db PATH]
+# Every Country x Gender x age_group series with at least MIN_YEARS years is packed into one dense
+# year-aligned matrix (series x years, NaN where a year is missing) and fitted all at once:
+#   linear -> least squares per series from its 2x2 normal equations, solved as one batched
+#             np.linalg.solve; interval from the prediction variance s^2 (1 + x0' (X'X)^-1 x0)
+#   damped -> additive damped-trend exponential smoothing (ETS A,Ad,N). The recursion steps
+#             through the years once for all series and every (alpha, beta, phi) in GRID, and each
+#             series keeps the parameters with the smallest one-step-ahead squared error; interval
+#             from sigma^2 (1 + sum_j (alpha + beta phi_j)^2) over the steps since its last year
+# Intervals are normal 95% intervals; estimates and bounds are clipped to 0-100. Series are fitted
+# CHUNK_SERIES at a time so memory stays bounded at any scale. Results replace forecast_<table>
+# in nutrition.db: one row per series, model and projected year (the years after the data, to --to).
+# database.py and refresh_data.py refit them after every load (rebuild_forecasts), keeping the
+# horizon and models of the forecasts already there.
+HORIZON = 2030
+Z = 1.96
+MIN_YEARS = 3
+CHUNK_SERIES = 20_000
+GRID = [(alpha, beta, phi) for alpha in (0.2, 0.4, 0.6, 0.8, 1.0) for beta in (0.0, 0.05, 0.1, 0.2)
+        for phi in (0.8, 0.9, 0.98)]
+COLUMNS = SERIES + ["model", "Year", "forecast", "lower", "upper"]
+
+
+# Series-year averages, from trend_<table> (trends.py) when it exists, else aggregated here
+def load_series(conn, table, country=None):
+    series = ", ".join(SERIES)
+    where, params = ("Country = ?", (country,)) if country is not None else ("1", ())
+    if has_trends(conn, table):
+        sql = f"SELECT {series}, Year, estimate FROM trend_{table} WHERE {where}"
+    else:
+        sql = (f"SELECT {series}, Year, AVG(Mean_Estimate) AS estimate FROM {table} "
+               f"WHERE Year IS NOT NULL AND Mean_Estimate IS NOT NULL AND {where} GROUP BY {series}, Year")
+    return fetch_frame(conn.execute(sql, params))
+
+
+# (keys, years, Y): Y[i, j] is series keys.iloc[i] in years[j], NaN where it has no data
+def pack(df):
+    if df.empty:
+        return df[SERIES].reset_index(drop=True), np.array([], dtype=int), np.empty((0, 0))
+    codes = df.groupby(SERIES, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    keys = df[SERIES].drop_duplicates().reset_index(drop=True)
+    year = df["Year"].to_numpy(dtype=int)
+    years = np.arange(year.min(), year.max() + 1)
+    Y = np.full((len(keys), len(years)), np.nan)
+    Y[codes, year - years[0]] = df["estimate"].to_numpy(dtype=float)
+    return keys, years, Y
+
+
+def _normal_equations(x, Y):
+    observed = ~np.isnan(Y)
+    y = np.where(observed, Y, 0.0)
+    xw = observed * x
+    n, sx, sxx = observed.sum(1), xw.sum(1), (xw * x).sum(1)
+    XtX = np.stack([np.stack([n, sx], -1), np.stack([sx, sxx], -1)], -2)
+    Xty = np.stack([y.sum(1), (y * x).sum(1)], -1)
+    return XtX, Xty, observed
+
+
+# mean and standard error (series x target years) of the least-squares line per series
+def fit_linear(years, Y, target):
+    x = (years - years.mean()).astype(float)
+    XtX, Xty, observed = _normal_equations(x, Y)
+    coef = np.linalg.solve(XtX, Xty[..., None])[..., 0]
+    residuals = np.where(observed, Y - (coef[:, :1] + coef[:, 1:] * x), 0.0)
+    sigma = np.sqrt((residuals ** 2).sum(1) / (observed.sum(1) - 2))
+    X0 = np.stack([np.ones(len(target)), target - years.mean()], -1)
+    leverage = np.einsum("hi,sij,hj->sh", X0, np.linalg.inv(XtX), X0)
+    return coef @ X0.T, sigma[:, None] * np.sqrt(1 + leverage)
+
+
+# mean and standard error (series x target years) of the best damped-trend model per series
+def fit_damped(years, Y, target, grid=GRID):
+    S, T = Y.shape
+    rows = np.arange(S)
+    alpha, beta, phi = (np.array(p)[:, None] for p in zip(*grid))
+    observed = ~np.isnan(Y)
+    first = observed.argmax(1)
+    last = T - 1 - observed[:, ::-1].argmax(1)
+    # start from the first observation with the least-squares slope as the initial trend
+    XtX, Xty, _ = _normal_equations((years - years.mean()).astype(float), Y)
+    level = np.tile(Y[rows, first], (len(grid), 1))
+    trend = np.tile(np.linalg.solve(XtX, Xty[..., None])[:, 1, 0], (len(grid), 1))
+    sse = np.zeros((len(grid), S))
+    for t in range(T):
+        started = t > first
+        predicted = level + phi * trend
+        error = np.where(observed[:, t] & started, Y[:, t] - predicted, 0.0)
+        level = np.where(started, predicted + alpha * error, level)
+        trend = np.where(started, phi * trend + beta * error, trend)
+        sse += error ** 2
+    best = sse.argmin(0)
+    level, trend, sse = level[best, rows], trend[best, rows], sse[best, rows]
+    alpha, beta, phi = alpha[best, 0][:, None], beta[best, 0][:, None], phi[best, 0][:, None]
+    sigma = np.sqrt(sse / (observed.sum(1) - 1))
+
+    # the state was carried to the last matrix year; h counts from each series' last observation
+    carried = (T - 1 - last)[:, None]
+    steps = carried + (target - years[-1])[None, :]
+    damping = phi * (1 - phi ** (steps - carried)) / (1 - phi)
+    mean = level[:, None] + damping * trend[:, None]
+    j = np.arange(1, steps.max())[None, :]
+    c = alpha + beta * phi * (1 - phi ** j) / (1 - phi)
+    variance = np.concatenate([np.ones((S, 1)), 1 + np.cumsum(c ** 2, axis=1)], axis=1)
+    return mean, sigma[:, None] * np.sqrt(np.take_along_axis(variance, steps - 1, axis=1))
+
+
+MODELS = {"linear": fit_linear, "damped": fit_damped}
+
+
+def _fit_chunked(fit, years, Y, target, chunk=CHUNK_SERIES):
+    parts = [fit(years, Y[i:i + chunk], target) for i in range(0, len(Y), chunk)]
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def _long(keys, model, target, mean, se):
+    frame = keys.loc[keys.index.repeat(len(target))].reset_index(drop=True)
+    frame["model"] = model
+    frame["Year"] = np.tile(target, len(keys))
+    frame["forecast"] = np.clip(mean.ravel(), 0, 100)
+    frame["lower"] = np.clip((mean - Z * se).ravel(), 0, 100)
+    frame["upper"] = np.clip((mean + Z * se).ravel(), 0, 100)
+    return frame
+
+
+# Projections for all series of one table -> (frame, series count, fit seconds per model); the
+# frame is empty when no series has MIN_YEARS years or the data already reaches the horizon
+def forecast_table(conn, table, models=tuple(MODELS), horizon=HORIZON):
+    keys, years, Y = pack(load_series(conn, table))
+    keep = (~np.isnan(Y)).sum(1) >= MIN_YEARS
+    keys, Y = keys[keep].reset_index(drop=True), Y[keep]
+    target = np.arange(years[-1] + 1, horizon + 1) if len(years) else np.array([], dtype=int)
+    if not len(keys) or not len(target):
+        return pd.DataFrame(columns=COLUMNS), len(keys), {}
+    frames, seconds = [], {}
+    for model in models:
+        start = time.perf_counter()
+        mean, se = _fit_chunked(MODELS[model], years, Y, target)
+        seconds[model] = time.perf_counter() - start
+        frames.append(_long(keys, model, target, mean, se))
+    return pd.concat(frames, ignore_index=True), len(keys), seconds
+
+
+def write_forecasts(conn, table, frame):
+    name = f"forecast_{table}"
+    with conn:
+        conn.execute(f"DROP TABLE IF EXISTS {name}")
+        conn.execute(f"CREATE TABLE {name}({', '.join(SERIES)}, model TEXT, Year INTEGER, "
+                     f"forecast REAL, lower REAL, upper REAL)")
+        conn.executemany(f"INSERT INTO {name} VALUES ({', '.join('?' * len(COLUMNS))})",
+                         frame[COLUMNS].astype(object).where(frame[COLUMNS].notna(), None).values.tolist())
+        conn.execute(f"CREATE INDEX ix_{name}_series ON {name}({', '.join(SERIES)}, model, Year)")
+    return len(frame)
+
+
+def has_forecasts(conn, table):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (f"forecast_{table}",)).fetchone() is not None
+
+
+# (horizon, models) of forecast_<table>, the defaults when there is none yet
+def forecast_settings(conn, table):
+    if not has_forecasts(conn, table):
+        return HORIZON, tuple(MODELS)
+    horizon = conn.execute(f"SELECT MAX(Year) FROM forecast_{table}").fetchone()[0]
+    models = {row[0] for row in conn.execute(f"SELECT DISTINCT model FROM forecast_{table}")}
+    return horizon or HORIZON, tuple(m for m in MODELS if m in models) or tuple(MODELS)
+
+
+# Refits forecast_<table> on the current data, after a load or refresh
+def rebuild_forecasts(conn, tables=TABLES):
+    rebuilt = {}
+    for table in tables:
+        horizon, models = forecast_settings(conn, table)
+        frame, _, _ = forecast_table(conn, table, models, horizon)
+        rebuilt[f"forecast_{table}"] = write_forecasts(conn, table, frame)
+    return rebuilt
+
+
+# History (series-year averages) and projections of one country's series, for the dashboard
+def country_forecast(conn, table, country, model):
+    history = load_series(conn, table, country)
+    projection = fetch_frame(conn.execute(
+        f"SELECT {', '.join(SERIES)}, Year, forecast, lower, upper FROM forecast_{table} "
+        f"WHERE Country = ? AND model = ? ORDER BY {', '.join(SERIES)}, Year", (country, model)))
+    return history, projection
+
+
+if __name__ == "__main__":
+    def option(flag, default):
+        return sys.argv[sys.argv.index(flag) + 1] if flag in sys.argv else default
+
+    horizon = int(option("--to", HORIZON))
+    model = option("--model", "both")
+    models = tuple(MODELS) if model == "both" else (model,)
+    conn = sqlite3.connect(option("--db", "nutrition.db"))
+    for table in TABLES:
+        frame, series, seconds = forecast_table(conn, table, models, horizon)
+        rows = write_forecasts(conn, table, frame)
+        fits = ", ".join(f"{m} {s:.2f}s ({series / s:,.0f} series/s)" for m, s in seconds.items())
+        print(f"{table}: {series} series to {horizon}: {fits}; {rows} rows -> forecast_{table}")
+    conn.close()
@@ -1,141 +1,94 @@
-import requests
+import sys
+import time
 import pandas as pd
-import pycountry
+from gho_cache import ResponseCache
+from gho_client import fetch_all, fetch_all_frames, print_fetch_stats
+from indicators import COLUMNS, DATASETS, INDICATORS, MAX_WORKERS, YEAR_RANGE, indicator_params, indicator_urls
+from schema import apply_schema, print_memory_report
+from storage import write_frame
+from transforms import print_timings, run_transforms, split_datasets
+
+# --stream decodes each response incrementally into typed columns instead of calling .json()
+STREAM = "--stream" in sys.argv
+# Responses are cached in .gho_cache/ and revalidated with ETag/If-Modified-Since once GHO_CACHE_TTL expires.
+# --offline replays the cache without touching the network, --no-cache always downloads.
+OFFLINE = "--offline" in sys.argv
+cache = None if "--no-cache" in sys.argv else ResponseCache(offline=OFFLINE)
+# --csv also exports every output as CSV next to the Parquet files
+CSV = "--csv" in sys.argv
 
 # ---------------- Step 1: WHO API URLs ----------------
-urls = {
-    "obesity_adults": 'https://ghoapi.azureedge.net/api/NCD_BMI_30C',
-    "obesity_children": 'https://ghoapi.azureedge.net/api/NCD_BMI_PLUS2C',
-    "malnutrition_adults": 'https://ghoapi.azureedge.net/api/NCD_BMI_18C',
-    "malnutrition_children": 'https://ghoapi.azureedge.net/api/NCD_BMI_MINUS2C'
-}
+# Indicators, year range and kept fields come from indicators.json; the year range and fields are
+# pushed to the server as OData $filter/$select, so the payload only carries what Steps 6-7 keep.
+# --full downloads everything.
+FULL = "--full" in sys.argv
+urls = indicator_urls(INDICATORS)
+params = None if FULL else indicator_params(INDICATORS)
+cols = ["indicator","dataset","ParentLocation","Dim1","TimeDim","Low","High","NumericValue","SpatialDim","age_group","Dim2"]
+print(f"Step 1: {len(urls)} indicators across datasets {DATASETS}")
 
-# ---------------- Step 2: Fetch JSON data ----------------
-data = {k: requests.get(v).json() for k,v in urls.items()}
-for k in data:
-    print(f"Step 2: Sample JSON data for {k} (first 2 rows):")
-    print(data[k]['value'][:2], "\n")
+# ---------------- Step 2: Fetch JSON data (concurrent, pooled, retried) ----------------
+fetch_start = time.perf_counter()
+if STREAM:
+    data, fetch_stats = fetch_all_frames(urls, COLUMNS, params, max_workers=MAX_WORKERS, cache=cache)
+else:
+    data, fetch_stats = fetch_all(urls, params, max_workers=MAX_WORKERS, cache=cache)
+print("Step 2: Fetched indicators" + (" (streaming)" if STREAM else ""))
+print_fetch_stats(fetch_stats, time.perf_counter() - fetch_start)
+first = next(iter(data))
+print(f"Step 2: Sample JSON data for {first} (first 2 rows):")
+print(data[first].head(2) if STREAM else data[first]['value'][:2], "\n")
 
 # ---------------- Step 3: Convert to DataFrames ----------------
-df_ob_a = pd.DataFrame(data["obesity_adults"]['value'])
-df_ob_c = pd.DataFrame(data["obesity_children"]['value'])
-df_ma_a = pd.DataFrame(data["malnutrition_adults"]['value'])
-df_ma_c = pd.DataFrame(data["malnutrition_children"]['value'])
+frames = {code: payload if STREAM else pd.DataFrame(payload['value']) for code, payload in data.items()}
+del data
 print("Step 3: DataFrames created")
-print("Obesity Adults:")
-print(df_ob_a.head(), "\n")
-print(df_ob_c.head(), "\n")
-print("Malnutrition Adults:")
-print(df_ma_a.head(), "\n")
-print(df_ob_c.head(), "\n")
+for code, df in frames.items():
+    print(f"  {code:<24} {len(df)} rows")
 
-# ---------------- Step 4: Add age_group ----------------
-df_ob_a['age_group'] = "Adult"
-df_ob_c['age_group'] = "Child/Adolescent"
-df_ma_a['age_group'] = "Adult"
-df_ma_c['age_group'] = "Child/Adolescent"
-print("Step 4: age_group added")
-print("Obesity Adults:")
-print(df_ob_a.head()[['Dim1','age_group']], "\n")
-print("Obesity Children:")
-print(df_ob_c.head()[['Dim1','age_group']], "\n")
-print("Malnutrition Adults:")
-print(df_ma_a.head()[['Dim1','age_group']], "\n")
-print("Malnutrition Children:")
-print(df_ma_c.head()[['Dim1','age_group']], "\n")
+# ---------------- Step 4: Tag indicator, dataset and age_group ----------------
+for code, df in frames.items():
+    spec = INDICATORS[code]
+    frames[code] = df.assign(indicator=code, dataset=spec["dataset"], age_group=spec["age_group"])
+print("Step 4: indicator, dataset and age_group added")
+for code, spec in INDICATORS.items():
+    print(f"  {code:<24} {spec['dataset']:<14} {spec['age_group']}")
 
-# ---------------- Step 5: Combine adults+children ----------------
-df_obesity = pd.concat([df_ob_a, df_ob_c], ignore_index=True)
-df_malnutrition = pd.concat([df_ma_a, df_ma_c], ignore_index=True)
-print("Step 5: Adults and children combined")
-print("Obesity:")
-print(df_obesity.head(10)[['age_group','Dim1','NumericValue']], "\n")
-print("Malnutrition:")
-print(df_malnutrition.head(10)[['age_group','Dim1','NumericValue']], "\n")
+# ---------------- Step 5: Combine all indicators into one long-format frame ----------------
+df_facts = pd.concat(frames.values(), ignore_index=True)
+del frames
+print("Step 5: Indicators combined")
+print(df_facts.head(10)[['indicator','age_group','Dim1','NumericValue']], "\n")
 
 # ---------------- Step 6: Filter years 2012-2022 ----------------
-df_obesity = df_obesity[(df_obesity['TimeDim'] >= 2012) & (df_obesity['TimeDim'] <= 2022)]
-df_malnutrition = df_malnutrition[(df_malnutrition['TimeDim'] >= 2012) & (df_malnutrition['TimeDim'] <= 2022)]
-print("Step 6: Filtered years 2012-2022")
-print("Obesity years:", df_obesity['TimeDim'].unique())
-print("Malnutrition years:", df_malnutrition['TimeDim'].unique(), "\n")
+# Already applied server-side unless --full; kept as a guard
+first_year, last_year = YEAR_RANGE
+df_facts = df_facts[(df_facts['TimeDim'] >= first_year) & (df_facts['TimeDim'] <= last_year)]
+print(f"Step 6: Filtered years {first_year}-{last_year}")
+print("Years:", sorted(df_facts['TimeDim'].unique()), "\n")
 
 # ---------------- Step 7: Keep necessary columns ----------------
-cols = ["ParentLocation","Dim1","TimeDim","Low","High","NumericValue","SpatialDim","age_group"]
-df_obesity = df_obesity[cols]
-df_malnutrition = df_malnutrition[cols]
+df_facts = df_facts[cols]
 print("Step 7: Kept necessary columns")
-print("Obesity:")
-print(df_obesity.head(), "\n")
-print("Malnutrition:")
-print(df_malnutrition.head(), "\n")
-
-# ---------------- Step 8: Rename columns ----------------
-rename_cols = {
-    'TimeDim': 'Year',
-    'Dim1': 'Gender',
-    'NumericValue': 'Mean_Estimate',
-    'Low': 'LowerBound',
-    'High': 'UpperBound',
-    'ParentLocation': 'Region',
-    'SpatialDim': 'Country'
-}
-df_obesity = df_obesity.rename(columns=rename_cols)
-df_malnutrition = df_malnutrition.rename(columns=rename_cols)
-print("Step 8: Columns renamed")
-print("Obesity:")
-print(df_obesity.head(), "\n")
-print("Malnutrition:")
-print(df_malnutrition.head(), "\n")
-
-# ---------------- Step 9: Standardize Gender ----------------
-gender_map = {'sex_mle': 'Male', 'sex_fmle': 'Female', 'sex_btsx': 'Both'}
-df_obesity['Gender'] = df_obesity['Gender'].str.lower().replace(gender_map)
-df_malnutrition['Gender'] = df_malnutrition['Gender'].str.lower().replace(gender_map)
-print("Step 9: Gender standardized")
-print("Obesity Genders:", df_obesity['Gender'].unique())
-print("Malnutrition Genders:", df_malnutrition['Gender'].unique(), "\n")
-
-# ---------------- Step 10: Convert country codes ----------------
-special_cases = {
-    'GLOBAL': 'Global', 'WB_LMI': 'Low & Middle Income', 'WB_HI': 'High Income',
-    'WB_LI': 'Low Income', 'WB_UMI': 'Upper Middle Income', 'EMR': 'Eastern Mediterranean Region',
-    'EUR': 'Europe', 'AFR': 'Africa', 'SEAR': 'South-East Asia Region',
-    'WPR': 'Western Pacific Region', 'AMR': 'Americas Region'
-}
-def convert_country(code):
-    if pd.isna(code): return code
-    if code in special_cases: return special_cases[code]
-    c = pycountry.countries.get(alpha_3=code)
-    return c.name if c else code
-
-df_obesity['Country'] = df_obesity['Country'].apply(convert_country)
-df_malnutrition['Country'] = df_malnutrition['Country'].apply(convert_country)
-print("Step 10: Country codes converted")
-print("Obesity Countries:")
-print(df_obesity['Country'].head(), "\n")
-print("Malnutrition Countries:")
-print(df_malnutrition['Country'].head(), "\n")
+print(df_facts.head(), "\n")
 
-# ---------------- Step 11: CI Width ----------------
-df_obesity['CI_Width'] = df_obesity['UpperBound'] - df_obesity['LowerBound']
-df_malnutrition['CI_Width'] = df_malnutrition['UpperBound'] - df_malnutrition['LowerBound']
-print("Step 11: CI Width calculated")
-print("Obesity:")
-print(df_obesity[['LowerBound','UpperBound','CI_Width']].head(), "\n")
-print("Malnutrition:")
-print(df_malnutrition[['LowerBound','UpperBound','CI_Width']].head(), "\n")
+# ---------------- Steps 8-12: Rename, gender, country, CI width, levels ----------------
+# One vectorized pass over every indicator, driven by transforms.TRANSFORM_SPEC
+df_facts, timings = run_transforms(df_facts)
+print("Steps 8-12: Transforms applied")
+print_timings(timings, len(df_facts))
+print(df_facts.head(), "\n")
+print("Genders:", df_facts['Gender'].unique())
+print("Levels:", df_facts.groupby(['dataset','level'], observed=True).size().to_dict(), "\n")
 
-# ---------------- Step 12: Obesity & Malnutrition levels ----------------
-df_obesity['obesity_level'] = df_obesity['Mean_Estimate'].apply(lambda x: 'High' if x >=30 else 'Moderate' if 25<=x<=29.9 else 'Low')
-df_malnutrition['malnutrition_level'] = df_malnutrition['Mean_Estimate'].apply(lambda x: 'High' if x>=20 else 'Moderate' if 10<=x<=19.9 else 'Low')
-print("Step 12: Levels assigned")
-print("Obesity:")
-print(df_obesity[['Mean_Estimate','obesity_level']].head(), "\n")
-print("Malnutrition:")
-print(df_malnutrition[['Mean_Estimate','malnutrition_level']].head(), "\n")
+# Categorical text and int16 years (schema.py); estimates stay float64 for the saved files
+df_facts = apply_schema(df_facts, downcast_floats=False)
+print("Memory:")
+print_memory_report({"df_nutrition_facts": df_facts})
 
-# ---------------- Step 13: Save CSV ----------------
-df_obesity.to_csv("df_obesity_clean.csv", index=False)
-df_malnutrition.to_csv("df_malnutrition_clean.csv", index=False)
-print("Step 13: CSVs saved. Data cleaning complete!")
\ No newline at end of file
+# ---------------- Step 13: Save Parquet (and CSV with --csv) ----------------
+# Long-format fact table with every indicator, plus one file per dataset for the downstream scripts
+saved = write_frame(df_facts, "df_nutrition_facts", csv=CSV)
+for dataset, df in split_datasets(df_facts).items():
+    saved += write_frame(df, f"df_{dataset}_clean", csv=CSV)
+print("Step 13: Saved", ", ".join(saved) + ". Data cleaning complete!")
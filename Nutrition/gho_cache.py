@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlencode
+
+# ---------------- Cache settings ----------------
+CACHE_DIR = os.environ.get("GHO_CACHE_DIR", ".gho_cache")
+TTL = int(os.environ.get("GHO_CACHE_TTL", 24 * 3600))   # seconds a response is served without asking the server
+CHUNK_SIZE = 64 * 1024
+
+
+# ---------------- On-disk response cache with conditional revalidation ----------------
+# Each response is stored as <key>.json (body) and <key>.meta.json (ETag, Last-Modified, fetch time).
+#   fresh       -> younger than the TTL, served from disk with no request
+#   revalidated -> older than the TTL, server answered 304 Not Modified to If-None-Match/If-Modified-Since
+#   miss        -> not cached yet (or changed on the server), body downloaded and stored
+#   offline     -> offline replay, served from disk whatever its age
+class ResponseCache:
+    def __init__(self, directory=CACHE_DIR, ttl=TTL, offline=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, url, params=None):
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".meta.json"
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, delete=False, suffix=".tmp") as f:
+            json.dump(meta, f)
+        os.replace(f.name, meta_path)
+
+    def fetch(self, session, url, params=None, timeout=None):
+        body_path, meta_path = self._paths(self.key(url, params))
+        meta = self._read_meta(meta_path)
+        if meta is not None and not os.path.exists(body_path):
+            meta = None
+
+        if self.offline:
+            if meta is None:
+                raise FileNotFoundError(f"Offline mode: no cached response for {url} {params or ''}")
+            return body_path, {"status": meta["status"], "bytes": 0, "cache": "offline"}
+
+        if meta is not None and time.time() - meta["fetched_at"] < self.ttl:
+            return body_path, {"status": meta["status"], "bytes": 0, "cache": "fresh"}
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        with session.get(url, params=params, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and meta is not None:
+                meta["fetched_at"] = time.time()
+                self._write_meta(meta_path, meta)
+                return body_path, {"status": 304, "bytes": 0, "cache": "revalidated"}
+            response.raise_for_status()
+
+            received = 0
+            with tempfile.NamedTemporaryFile("wb", dir=self.directory, delete=False, suffix=".tmp") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+            os.replace(f.name, body_path)
+            self._write_meta(meta_path, {
+                "url": url,
+                "params": params or {},
+                "status": response.status_code,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "bytes": received,
+            })
+            return body_path, {"status": response.status_code, "bytes": received, "cache": "miss"}
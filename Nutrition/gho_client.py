@@ -0,0 +1,118 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from gho_stream import CHUNK_SIZE, iter_file_chunks, read_frame
+
+# Requests go to indicators.GHO_API_BASE; point GHO_API_BASE at tests/gho_server.py (a stand-in
+# server with canned payloads) to run the client and the scripts without the real API.
+
+# ---------------- Fetch settings ----------------
+TIMEOUT = (5, 60)          # (connect, read) seconds
+RETRIES = 3
+BACKOFF = 0.5              # sleeps 0.5s, 1s, 2s between retries
+RETRY_STATUS = (429, 500, 502, 503, 504)
+MAX_WORKERS = 4
+
+
+# ---------------- One pooled session for every indicator ----------------
+def make_session(pool_size=MAX_WORKERS, retries=RETRIES, backoff=BACKOFF):
+    retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                  backoff_factor=backoff, status_forcelist=RETRY_STATUS,
+                  allowed_methods=frozenset(["GET"]), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# ---------------- Response body as byte chunks, from the network or the cache ----------------
+@contextmanager
+def _open_body(session, url, params, timeout, cache):
+    if cache is not None:
+        path, info = cache.fetch(session, url, params, timeout)
+        yield iter_file_chunks(path), info
+        return
+    with session.get(url, params=params, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        info = {"status": response.status_code, "bytes": 0, "cache": None}
+
+        def counted():
+            for chunk in response.iter_content(CHUNK_SIZE):
+                info["bytes"] += len(chunk)
+                yield chunk
+
+        yield counted(), info
+
+
+def _stats(name, info, start):
+    return {
+        "indicator": name,
+        "status": info["status"],
+        "bytes": info["bytes"],
+        "seconds": round(time.perf_counter() - start, 3),
+        "cache": info["cache"],
+    }
+
+
+# ---------------- Fetch a single indicator ----------------
+def fetch_json(session, name, url, params=None, timeout=TIMEOUT, cache=None):
+    start = time.perf_counter()
+    with _open_body(session, url, params, timeout, cache) as (chunks, info):
+        payload = json.loads(b"".join(chunks))
+    return payload, _stats(name, info, start)
+
+
+# ---------------- Stream a single indicator into typed columns ----------------
+# The body is decoded chunk by chunk; only the requested columns are ever kept.
+def fetch_frame(session, name, url, columns, params=None, timeout=TIMEOUT, cache=None):
+    start = time.perf_counter()
+    with _open_body(session, url, params, timeout, cache) as (chunks, info):
+        frame = read_frame(chunks, columns)
+    return frame, _stats(name, info, start)
+
+
+# ---------------- Fetch all indicators concurrently ----------------
+# Wall time is bounded by the slowest indicator instead of the sum of all of them.
+# params maps indicator name -> query parameters (e.g. OData $filter/$select) for that request.
+def fetch_all(urls, params=None, max_workers=MAX_WORKERS, session=None, timeout=TIMEOUT, cache=None):
+    return _fan_out(lambda s, name, url, p: fetch_json(s, name, url, p, timeout, cache),
+                    urls, params, max_workers, session)
+
+
+def fetch_all_frames(urls, columns, params=None, max_workers=MAX_WORKERS, session=None, timeout=TIMEOUT, cache=None):
+    return _fan_out(lambda s, name, url, p: fetch_frame(s, name, url, columns, p, timeout, cache),
+                    urls, params, max_workers, session)
+
+
+def _fan_out(fetch, urls, params, max_workers, session):
+    params = params or {}
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {name: pool.submit(fetch, session, name, url, params.get(name))
+                       for name, url in urls.items()}
+            data, stats = {}, []
+            for name, future in futures.items():
+                data[name], indicator_stats = future.result()
+                stats.append(indicator_stats)
+    finally:
+        if own_session:
+            session.close()
+    return data, stats
+
+
+def print_fetch_stats(stats, wall_seconds=None):
+    for s in stats:
+        cache = f"  cache={s['cache']}" if s.get("cache") else ""
+        print(f"  {s['indicator']:<24} status={s['status']}  {s['bytes']/1024:>9.1f} KB  {s['seconds']:>6.2f}s{cache}")
+    if wall_seconds is not None:
+        print(f"  wall time: {wall_seconds:.2f}s (sum of indicators: {sum(s['seconds'] for s in stats):.2f}s)")
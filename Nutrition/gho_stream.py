@@ -0,0 +1,156 @@
+import codecs
+import json
+import re
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# ---------------- Streaming settings ----------------
+CHUNK_SIZE = 64 * 1024
+
+# GHO fields decoded into float buffers; everything else is dictionary-encoded
+NUMERIC_COLUMNS = {"TimeDim": "int64", "Low": "float64", "High": "float64", "NumericValue": "float64"}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+# ---------------- Incremental reader over byte chunks ----------------
+class _ChunkReader:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self._utf8.decode(b"", final=True)
+        else:
+            text = self._utf8.decode(chunk)
+        # drop the consumed prefix so the buffer never holds more than one record plus a chunk
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed GHO payload: expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # a bare number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+# ---------------- Yield the records of the top-level "value" array one at a time ----------------
+def iter_values(chunks):
+    reader = _ChunkReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.decode()
+        reader.expect(":")
+        if key == "value":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.decode()
+                    sep = reader.peek()
+                    reader.pos += 1
+                    if sep == "]":
+                        break
+                    if sep != ",":
+                        raise ValueError(f"Malformed GHO payload: unexpected {sep!r} in value array")
+        else:
+            reader.decode()
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"Malformed GHO payload: unexpected {sep!r} after {key!r}")
+
+
+# ---------------- Typed columnar buffers ----------------
+# Numeric fields go into float arrays, text fields into int32 codes plus a small dictionary,
+# so memory grows with the kept columns only and never with the decoded JSON objects.
+class ColumnarBuffer:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.values = {c: array("d" if c in NUMERIC_COLUMNS else "i") for c in self.columns}
+        self.categories = {c: {} for c in self.columns if c not in NUMERIC_COLUMNS}
+        self.rows = 0
+
+    def append(self, record):
+        for c in self.columns:
+            v = record.get(c)
+            if c in NUMERIC_COLUMNS:
+                self.values[c].append(float("nan") if v is None else v)
+            elif v is None:
+                self.values[c].append(-1)
+            else:
+                self.values[c].append(self.categories[c].setdefault(v, len(self.categories[c])))
+        self.rows += 1
+
+    def __len__(self):
+        return self.rows
+
+    def to_frame(self):
+        frame = {}
+        for c in self.columns:
+            values = np.frombuffer(self.values[c], dtype="float64" if c in NUMERIC_COLUMNS else "int32")
+            if c not in NUMERIC_COLUMNS:
+                frame[c] = pd.Categorical.from_codes(values, categories=list(self.categories[c]))
+            elif NUMERIC_COLUMNS[c] == "int64" and not np.isnan(values).any():
+                frame[c] = values.astype("int64")
+            else:
+                frame[c] = values.copy()
+        return pd.DataFrame(frame)
+
+
+# The streaming path (gho_client.fetch_frame): records are decoded one at a time from the byte
+# chunks straight into one buffer, so peak memory is one chunk, one record and the typed columns,
+# whatever the payload size; there are no per-batch frames to concatenate
+def read_frame(chunks, columns):
+    buffer = ColumnarBuffer(columns)
+    for record in iter_values(chunks):
+        buffer.append(record)
+    return buffer.to_frame()
+
+
+def iter_file_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,67 @@
+import json
+import os
+
+# ---------------- WHO GHO indicator registry ----------------
+# GHO_API_BASE can point at a local stand-in server serving canned GHO JSON
+GHO_API_BASE = os.environ.get("GHO_API_BASE", "https://ghoapi.azureedge.net/api").rstrip("/")
+
+# indicators.json maps each GHO indicator code to a dataset, an age group and level thresholds
+# (an indicator's own "levels" override its dataset's). Adding an indicator is one line there.
+REGISTRY_FILE = os.environ.get(
+    "NUTRITION_INDICATORS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "indicators.json"))
+
+
+def load_registry(path=REGISTRY_FILE):
+    with open(path, encoding="utf-8") as f:
+        registry = json.load(f)
+    indicators = {}
+    for code, spec in registry["indicators"].items():
+        dataset = registry["datasets"][spec["dataset"]]
+        indicators[code] = {
+            "code": code,
+            "dataset": spec["dataset"],
+            "age_group": spec["age_group"],
+            "levels": spec.get("levels", dataset["levels"]),
+            "years": tuple(spec.get("years", registry["years"])),
+            "columns": spec.get("columns", registry["columns"]),
+        }
+    return registry, indicators
+
+
+REGISTRY, INDICATORS = load_registry()
+
+# Rows and fields the pipeline keeps; pushed to the server as OData $filter / $select
+YEAR_RANGE = tuple(REGISTRY["years"])
+COLUMNS = REGISTRY["columns"]
+MAX_WORKERS = REGISTRY.get("max_workers", 4)
+DATASETS = list(REGISTRY["datasets"])
+
+
+def indicator_url(spec, base=None):
+    return f"{base or GHO_API_BASE}/{spec['code']}"
+
+
+# since=(year, date) narrows the request to records newer than a high-water mark
+def odata_params(spec, since=None, extra_columns=()):
+    first, last = spec.get("years", YEAR_RANGE)
+    row_filter = f"TimeDim ge {first} and TimeDim le {last}"
+    if since is not None:
+        year, date = since
+        row_filter += f" and (TimeDim gt {year} or Date gt {date})"
+    return {
+        "$filter": row_filter,
+        "$select": ",".join(list(spec.get("columns", COLUMNS)) + list(extra_columns)),
+    }
+
+
+def indicator_urls(indicators=INDICATORS, base=None):
+    return {name: indicator_url(spec, base) for name, spec in indicators.items()}
+
+
+def indicator_params(indicators=INDICATORS):
+    return {name: odata_params(spec) for name, spec in indicators.items()}
+
+
+def level_thresholds(indicators=INDICATORS):
+    return {code: spec["levels"] for code, spec in indicators.items()}
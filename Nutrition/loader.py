@@ -0,0 +1,56 @@
+from schema import TABLE_COLUMNS, table_sql
+
+# ---------------- Bulk loader for nutrition.db ----------------
+# Recreates a table from the declared schema (schema.table_sql) and fills it inside one
+# transaction with batched executemany, with synchronous=OFF for the load only (the caller's
+# setting is restored). Indexes are left to the caller so they are built once, after the data is in.
+# The database stays in WAL throughout, so a reload can run while the dashboard's pooled readers
+# are open (they keep reading the previous data until the commit). Switching to the rollback
+# journal for the load would save the double write of WAL, but changing the journal mode needs
+# exclusive access and fails with "database is locked" on a live database.
+# This is not faster than DataFrame.to_sql, which is also executemany in one transaction
+# (bench_load.py: 0.96-1.02x including indexes, which take ~3/4 of the time); what it adds is the
+# declared column types, which to_sql(if_exists='replace') drops.
+BATCH_SIZE = 10_000
+
+
+def _rows(df, cols):
+    # Python scalars per column (NaN -> NULL); zip turns them into row tuples without a per-row frame
+    values = [df[c].astype(object).where(df[c].notna(), None).tolist() for c in cols]
+    return zip(*values)
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_load(conn, dataset, df, batch_size=BATCH_SIZE):
+    cols = [c for c in TABLE_COLUMNS + [f"{dataset}_level"] if c in df.columns]
+    sql = f"INSERT INTO {dataset} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    try:
+        conn.execute("BEGIN")
+        try:
+            # a star layout load (star_schema.py) leaves a view under the table's name
+            kind = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (dataset,)).fetchone()
+            if kind:
+                conn.execute(f"DROP {kind[0].upper()} {dataset}")
+            conn.execute(table_sql(dataset))
+            for batch in _batches(_rows(df, cols), batch_size):
+                conn.executemany(sql, batch)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+    return len(df)
@@ -0,0 +1,74 @@
+import os
+import re
+
+from schema import TABLES
+
+# ---------------- Paged result browsing for the dashboard ----------------
+# Row-level catalog queries (SELECT ... FROM <table> [WHERE ...], no aggregates, joins, ORDER BY
+# or LIMIT) are never fetched whole: each page is
+#     SELECT <key> AS _key, ... FROM <table> WHERE (<condition>) AND <key> > :last ORDER BY <key> LIMIT :rows
+# so a page costs the same wherever it is in the result, and the total is one COUNT(*) that the
+# condition's index answers (ix_<table>_ci_width for CI_Width > 5). <key> is the backend's row_key,
+# the rowid (SQLite tables, materialized DuckDB tables); backends without one (the SQLite star
+# layout's views, DuckDB views over Parquet) and all other queries, whose results are small
+# aggregates, page through the cached result frame.
+# A position is the key after which a page starts (the row offset for frames); the dashboard
+# keeps the positions of the pages visited for Previous.
+PAGE_ROWS = int(os.environ.get("NUTRITION_PAGE_ROWS", 100))
+KEY = "_key"
+
+_ROW_QUERY = re.compile(r"^\s*SELECT\s+(?P<select>.+?)\s+FROM\s+(?P<table>\w+)(?:\s+WHERE\s+(?P<where>.+?))?\s*;?\s*$",
+                        re.IGNORECASE | re.DOTALL)
+_NOT_ROW_LEVEL = re.compile(r"\b(?:GROUP\s+BY|ORDER\s+BY|LIMIT|JOIN|UNION|DISTINCT|HAVING|SELECT\s.+\bSELECT)\b|"
+                            r"\b(?:AVG|SUM|COUNT|MIN|MAX|TOTAL|GROUP_CONCAT)\s*\(", re.IGNORECASE | re.DOTALL)
+
+
+# (select list, table, condition or None) for a row-level query on a catalog table, else None
+def row_query(sql):
+    match = _ROW_QUERY.match(sql)
+    if match is None or _NOT_ROW_LEVEL.search(sql) or match.group("table").lower() not in TABLES:
+        return None
+    return match.group("select"), match.group("table"), match.group("where")
+
+
+def count_sql(parts):
+    _, table, where = parts
+    return f"SELECT COUNT(*) AS n FROM {table}" + (f" WHERE {where}" if where else "")
+
+
+def page_sql(parts, key):
+    select, table, where = parts
+    condition = f"({where}) AND {key} > ?" if where else f"{key} > ?"
+    return f"SELECT {key} AS {KEY}, {select} FROM {table} WHERE {condition} ORDER BY {key} LIMIT ?"
+
+
+class Pager:
+    """One catalog query's pages: keyset pages through run(name, sql, params) when the query is
+    row-level and the backend has a row key, otherwise slices of the full result from run(name, sql)."""
+
+    def __init__(self, run, backend, name, sql, rows=PAGE_ROWS):
+        self.run, self.name, self.sql, self.rows = run, name, sql, rows
+        self.key = backend.row_key
+        self.parts = row_query(sql) if self.key else None
+        if self.parts is None:
+            self.frame = run(name, sql)
+            self.total = len(self.frame)
+        else:
+            self.frame = None
+            self.total = int(run(f"{name} [count]", count_sql(self.parts))["n"].iloc[0])
+        # position before the first row (rowids start at 1 in SQLite, 0 in DuckDB)
+        self.start = 0 if self.frame is not None else -1
+
+    @property
+    def keyset(self):
+        return self.parts is not None
+
+    # (page frame, position after its last row)
+    def page(self, after):
+        if not self.keyset:
+            page = self.frame.iloc[after:after + self.rows]
+            return page, after + len(page)
+        page = self.run(f"{self.name} [page]", page_sql(self.parts, self.key), (after, self.rows))
+        if page.empty:
+            return page.drop(columns=KEY), after
+        return page.drop(columns=KEY).reset_index(drop=True), int(page[KEY].iloc[-1])
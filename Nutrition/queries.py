@@ -1,8 +1,5 @@
-import sqlite3
-import pandas as pd
-
-# Connect SQLite DB
-conn = sqlite3.connect("nutrition.db")
+from backends import open_backend
+from trends import FLAT_SLOPE
 
 # Dictionary with 25 meaningful queries
 queries = {
@@ -149,13 +146,28 @@ queries = {
         ORDER BY Avg_Malnutrition ASC;
     """,
 
-    "Countries with increasing malnutrition": """
+    # Rising series (Country x Gender x age_group): least-squares slope of the yearly averages
+    # above trends.FLAT_SLOPE points per year (SQLite answers it from trend_malnutrition);
+    # Year is widened for Year * Year (DuckDB reads it as a 16-bit column from Parquet)
+    "Countries with increasing malnutrition": f"""
         SELECT Country,
-        MIN(Mean_Estimate) AS Min_Value,
-        MAX(Mean_Estimate) AS Max_Value
-        FROM malnutrition
+        COUNT(*) AS Rising_Series,
+        MAX(slope) AS Max_Slope
+        FROM (
+            SELECT Country, Gender, age_group,
+            (COUNT(*) * SUM(Year * estimate) - SUM(Year) * SUM(estimate))
+                / NULLIF(COUNT(*) * SUM(Year * Year) - SUM(Year) * SUM(Year), 0) AS slope
+            FROM (
+                SELECT Country, Gender, age_group, CAST(Year AS INTEGER) AS Year, AVG(Mean_Estimate) AS estimate
+                FROM malnutrition
+                WHERE Year IS NOT NULL AND Mean_Estimate IS NOT NULL
+                GROUP BY Country, Gender, age_group, Year
+            )
+            GROUP BY Country, Gender, age_group
+        )
+        WHERE slope > {FLAT_SLOPE}
         GROUP BY Country
-        HAVING Max_Value > Min_Value;
+        ORDER BY Max_Slope DESC, Country;
     """,
 
     "Min/Max malnutrition levels year-wise comparison": """
@@ -232,10 +244,14 @@ queries = {
     """
 }
 
-# Execute queries and store results
-results = {}
-for name, q in queries.items():
-    results[name] = pd.read_sql_query(q, conn)
-    print(f"\n{name}:\n", results[name].head(10))  # show top 10 rows for preview
+# Execute queries and store results (importing this module only loads the catalog)
+if __name__ == "__main__":
+    # nutrition.db by default; NUTRITION_BACKEND=duckdb reads the verified Parquet files (backends.py)
+    backend = open_backend()
+
+    results = {}
+    for name, q in queries.items():
+        results[name] = backend.query(name, q)
+        print(f"\n{name}:\n", results[name].head(10))  # show top 10 rows for preview
 
-conn.close()
\ No newline at end of file
+    backend.close()
\ No newline at end of file
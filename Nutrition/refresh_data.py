@@ -0,0 +1,105 @@
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+from forecast import has_forecasts, rebuild_forecasts
+from gho_client import fetch_all_frames, print_fetch_stats
+from indicators import COLUMNS, INDICATORS, MAX_WORKERS, indicator_urls, odata_params
+from result_cache import bump_data_version
+from rollups import refresh_rollups
+from star_schema import is_star
+from transforms import NATURAL_KEY, run_transforms, split_datasets
+from trends import refresh_trends
+
+# Incremental refresh of nutrition.db: fetch only GHO records newer than the last run
+# and upsert them into obesity/malnutrition, instead of get_data -> eda -> database.
+conn = sqlite3.connect("nutrition.db")
+
+# ---------------- Step 1: Load high-water marks ----------------
+conn.execute("""
+CREATE TABLE IF NOT EXISTS ingest_state(
+    indicator TEXT PRIMARY KEY, max_year INTEGER, max_date TEXT, refreshed_at TEXT
+)
+""")
+marks = {code: (year, date) for code, year, date in
+         conn.execute("SELECT indicator, max_year, max_date FROM ingest_state")}
+print("Step 1: High-water marks")
+for code in INDICATORS:
+    print(f"  {code:<18} {marks.get(code, 'none (first run fetches everything)')}")
+
+# ---------------- Step 2: Fetch only newer or changed records ----------------
+urls = indicator_urls(INDICATORS)
+params = {code: odata_params(spec, since=marks.get(code), extra_columns=["Date"])
+          for code, spec in INDICATORS.items()}
+fetch_start = time.perf_counter()
+frames, fetch_stats = fetch_all_frames(urls, COLUMNS + ["Date"], params, max_workers=MAX_WORKERS)
+print("Step 2: Fetched deltas")
+print_fetch_stats(fetch_stats, time.perf_counter() - fetch_start)
+for code, df in frames.items():
+    print(f"  {code:<24} {len(df)} new/changed rows")
+
+# ---------------- Step 3: Clean deltas like the full pipeline ----------------
+parts = [frames[code].assign(indicator=code, dataset=spec["dataset"], age_group=spec["age_group"])
+         for code, spec in INDICATORS.items()]
+combined = pd.concat(parts, ignore_index=True).drop(columns=["Date"])
+deltas = {}
+if not combined.empty:
+    combined, timings = run_transforms(combined)
+    combined['Region'] = combined['Region'].astype(object).fillna('Unknown')   # Region fix from eda_clean_visualize.py
+    deltas = split_datasets(combined)
+print("Step 3: Deltas cleaned:", {k: len(v) for k, v in deltas.items()})
+
+# ---------------- Step 4: Upsert on the natural key ----------------
+upserted = set()   # datasets whose deltas are in nutrition.db; only their marks advance in step 5
+for table, df in deltas.items():
+    table_cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if not table_cols:
+        print(f"Step 4: {table}: no such table in nutrition.db, skipped (run database.py for the initial load)")
+        continue
+    if is_star(conn, table):
+        sys.exit(f"{table} is a star layout view, rerun database.py --star instead of refreshing in place")
+    if 'age_band' not in table_cols or conn.execute(f"SELECT 1 FROM {table} WHERE age_band IS NULL LIMIT 1").fetchone():
+        sys.exit(f"Table {table} predates age_band, rerun get_data.py / eda_clean_visualize.py / database.py once")
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_key ON {table}({', '.join(NATURAL_KEY)})")
+
+    cols = [c for c in table_cols if c in df.columns]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c not in NATURAL_KEY)
+    sql = (f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+           f"ON CONFLICT ({', '.join(NATURAL_KEY)}) DO UPDATE SET {updates}")
+    rows = df[cols].astype(object).where(df[cols].notna(), None).values.tolist()
+
+    before = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    with conn:
+        conn.executemany(sql, rows)
+    inserted = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] - before
+    upserted.add(table)
+    print(f"Step 4: {table}: {inserted} inserted, {len(rows) - inserted} updated")
+    refreshed = refresh_rollups(conn, table, df)
+    if refreshed:
+        print(f"        rollup groups recomputed: {sum(refreshed.values())}")
+    trend_rows = refresh_trends(conn, table, df)
+    if trend_rows:
+        print(f"        trend rows recomputed: {trend_rows}")
+    if has_forecasts(conn, table):
+        print(f"        forecasts refitted: {rebuild_forecasts(conn, (table,))}")
+if any(not deltas[table].empty for table in upserted):
+    print("        data version:", bump_data_version(conn))
+
+# ---------------- Step 5: Advance high-water marks ----------------
+# A skipped dataset keeps its marks, so its records are fetched again by the next run
+now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+with conn:
+    for code, df in frames.items():
+        if df.empty or INDICATORS[code]["dataset"] not in upserted:
+            continue
+        max_year = int(df['TimeDim'].max())
+        max_date = pd.to_datetime(df['Date'].astype(str), utc=True).max().strftime("%Y-%m-%dT%H:%M:%SZ")
+        old_year, old_date = marks.get(code, (max_year, max_date))
+        conn.execute("INSERT OR REPLACE INTO ingest_state VALUES (?, ?, ?, ?)",
+                     (code, max(max_year, old_year), max(max_date, old_date), now))
+print("Step 5: High-water marks saved for", sorted(upserted) or "no dataset")
+
+conn.close()
+print("Incremental refresh complete!")
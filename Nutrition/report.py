@@ -0,0 +1,91 @@
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from combined import plan
+from db_pool import ConnectionPool
+from fetch import fetch_frame
+from queries import queries
+from rollups import route
+from trends import route_trends
+
+# ---------------- Parallel report run of the query catalog ----------------
+# python report.py [--workers N] [--max-rows N] [--out DIR] [--db PATH]
+# Runs every catalog query on a thread pool with one read-only connection per worker (SQLite
+# releases the GIL while a statement runs, so queries overlap across cores). Each result is capped
+# at --max-rows rows and written to <out>/qNN_<name>.csv; a capped result is counted with COUNT(*).
+# <out>/timings.csv records seconds, row count and worker per query. The next run submits the
+# slowest queries first according to that file, so one long query does not start last.
+def _option(flag, default):
+    if flag in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(flag) + 1])
+    return default
+
+
+WORKERS = _option("--workers", os.cpu_count() or 4)
+MAX_ROWS = _option("--max-rows", 10_000)
+OUT_DIR = _option("--out", "reports")
+DB_PATH = _option("--db", "nutrition.db")
+TIMINGS = "timings.csv"
+
+
+def _file_name(index, name):
+    return f"q{index:02d}_{re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')}.csv"
+
+
+def run_query(pool, name, sql, max_rows):
+    start = time.perf_counter()
+    with pool.reader() as conn:
+        routed = route(conn, route_trends(conn, name, plan(name, sql)))
+        cursor = conn.execute(routed)
+        df = fetch_frame(cursor, max_rows)
+        cursor.close()
+        total = len(df)
+        if total == max_rows:
+            # capped: count the full result in SQL instead of stepping through the rest of it here
+            total = conn.execute(f"SELECT COUNT(*) FROM ({routed.strip().rstrip(';')})").fetchone()[0]
+    seconds = time.perf_counter() - start
+    stats = {"query": name, "rows": total, "written": len(df), "truncated": total > len(df),
+             "seconds": round(seconds, 4), "worker": threading.current_thread().name}
+    return df, stats
+
+
+# Longest first by the previous run's timings; queries it does not know go first
+def _schedule(names, out_dir):
+    path = os.path.join(out_dir, TIMINGS)
+    if not os.path.exists(path):
+        return list(names)
+    previous = pd.read_csv(path).set_index("query")["seconds"].to_dict()
+    return sorted(names, key=lambda n: -previous.get(n, float("inf")))
+
+
+def run_report(catalog=queries, db_path=DB_PATH, workers=WORKERS, max_rows=MAX_ROWS, out_dir=OUT_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    pool = ConnectionPool(db_path, size=workers)
+    index = {name: i for i, name in enumerate(catalog, start=1)}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker") as executor:
+        futures = {name: executor.submit(run_query, pool, name, catalog[name], max_rows)
+                   for name in _schedule(catalog, out_dir)}
+        stats = []
+        for name, future in futures.items():
+            df, query_stats = future.result()
+            query_stats["file"] = _file_name(index[name], name)
+            df.to_csv(os.path.join(out_dir, query_stats["file"]), index=False)
+            stats.append(query_stats)
+    wall = time.perf_counter() - start
+    table = pd.DataFrame(stats).sort_values("query", key=lambda s: s.map(index), ignore_index=True)
+    table.to_csv(os.path.join(out_dir, TIMINGS), index=False)
+    return table, wall
+
+
+if __name__ == "__main__":
+    table, wall = run_report()
+    print(table[["query", "rows", "written", "seconds", "worker"]].to_string(index=False))
+    print(f"\n{len(table)} queries on {WORKERS} workers: wall {wall:.2f}s, "
+          f"sum of queries {table['seconds'].sum():.2f}s, slowest {table['seconds'].max():.2f}s")
+    print(f"Results and {TIMINGS} written to {OUT_DIR}/")
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+# ---------------- Versioned result cache for the query catalog ----------------
+# Results are kept per (backend, catalog query, bind parameters, data version), so repeat views
+# are served from memory until the next load changes the data version. Least recently used
+# results are evicted once the cached frames exceed MAX_BYTES.
+# The data version of nutrition.db is a load counter (data_version table) that database.py and
+# refresh_data.py bump after every load; SQLite's own PRAGMA data_version only sees commits made
+# while one connection stays open, and the dashboard opens a new one per rerun.
+MAX_BYTES = int(os.environ.get("NUTRITION_CACHE_MB", 256)) * 1024 * 1024
+
+
+def bump_data_version(conn):
+    now = datetime.now(timezone.utc).isoformat()
+    with conn:
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_version(
+            id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL, loaded_at TEXT NOT NULL
+        )
+        """)
+        conn.execute("INSERT INTO data_version VALUES (1, 1, ?) "
+                     "ON CONFLICT(id) DO UPDATE SET version = version + 1, loaded_at = excluded.loaded_at", (now,))
+    return read_data_version(conn)
+
+
+# (counter, load time) -- the time keeps a recreated nutrition.db from reusing an old counter.
+# None for a database no loader has stamped yet; its results are not cached.
+def read_data_version(conn):
+    try:
+        row = conn.execute("SELECT version, loaded_at FROM data_version").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return tuple(row) if row else None
+
+
+def _params_key(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
+
+
+# One instance is shared by every session of the app (Streamlit runs sessions on threads).
+# Callers get shallow copies: with copy-on-write, changing a returned frame never alters the cache.
+class ResultCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # key -> (frame, bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def query(self, backend, name, sql, params=None):
+        version = backend.data_version()
+        if version is None:
+            return backend.query(name, sql, params)
+        key = (backend.name, name, _params_key(params), version)
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0].copy(deep=False)
+            self.misses += 1
+        # run outside the lock; two sessions missing the same key both run it, the last one is kept
+        df = backend.query(name, sql, params)
+        self._store(key, df)
+        return df.copy(deep=False)
+
+    def _store(self, key, df):
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # results of an older data version of this backend can never be hit again
+            for old in [k for k in self.entries if k[0] == key[0] and k[3] != key[3]]:
+                self.nbytes -= self.entries.pop(old)[1]
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            self.entries[key] = (df, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self.entries.popitem(last=False)[1][1]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self.entries), "bytes": self.nbytes, "hits": self.hits, "misses": self.misses}
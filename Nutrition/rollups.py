@@ -0,0 +1,152 @@
+import re
+
+from schema import TABLES
+
+# ---------------- Materialized rollups for the query catalog ----------------
+# Each rollup keeps n_rows plus sum/count/min/max of every measure at one grain, so AVG, SUM, MIN,
+# MAX and COUNT over any subset of that grain can be answered from it instead of the fact rows.
+# route() rewrites single-table aggregate queries onto the smallest rollup that covers them.
+ROLLUPS = {
+    "detail": ["Country", "Region", "Year", "Gender", "age_group", "{level}"],
+    "country_level": ["Country", "age_group", "{level}"],
+    "country_year": ["Country", "Region", "Year"],
+    "year_gender_age": ["Year", "Region", "Gender", "age_group"],
+}
+MEASURES = ["Mean_Estimate", "CI_Width"]
+
+# Natural-key columns never change on an upsert (Region and the level can), so a rollup group is
+# recomputed whenever a changed row shares these grain columns with it
+STABLE_KEY = ["Country", "Year", "Gender", "age_group"]
+
+
+def _grain(name, level):
+    return [c.format(level=level) for c in ROLLUPS[name]]
+
+
+def _select(grain, table):
+    aggs = ["COUNT(*) AS n_rows"]
+    for m in MEASURES:
+        aggs += [f"SUM({m}) AS sum_{m}", f"COUNT({m}) AS cnt_{m}", f"MIN({m}) AS min_{m}", f"MAX({m}) AS max_{m}"]
+    return f"SELECT {', '.join(grain)}, {', '.join(aggs)} FROM {table}"
+
+
+def _record(conn, rollup, table, grain):
+    n = conn.execute(f"SELECT COUNT(*) FROM {rollup}").fetchone()[0]
+    conn.execute("INSERT OR REPLACE INTO rollup_catalog VALUES (?, ?, ?, ?)", (rollup, table, ",".join(grain), n))
+
+
+# ---------------- Build and incremental refresh ----------------
+def build_rollups(conn, tables=TABLES):
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS rollup_catalog")
+        conn.execute("CREATE TABLE rollup_catalog(rollup TEXT PRIMARY KEY, source TEXT, grain TEXT, n_groups INTEGER)")
+        for table, level in tables.items():
+            for name in ROLLUPS:
+                grain = _grain(name, level)
+                rollup = f"rollup_{table}_{name}"
+                conn.execute(f"DROP TABLE IF EXISTS {rollup}")
+                conn.execute(f"CREATE TABLE {rollup} AS {_select(grain, table)} GROUP BY {', '.join(grain)}")
+                conn.execute(f"CREATE INDEX ix_{rollup} ON {rollup}({', '.join(grain)})")
+                _record(conn, rollup, table, grain)
+    return dict(conn.execute("SELECT rollup, n_groups FROM rollup_catalog"))
+
+
+# changed holds the rows just upserted into table (at least the STABLE_KEY columns). Only the
+# groups they touch are deleted and re-aggregated from the table.
+def refresh_rollups(conn, table, changed, tables=TABLES):
+    if not has_rollups(conn) or changed.empty:
+        return {}
+    level = tables[table]
+    keys = changed[STABLE_KEY].drop_duplicates().astype(object).where(changed[STABLE_KEY].notna(), None)
+    refreshed = {}
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp.rollup_changes")
+        conn.execute(f"CREATE TEMP TABLE rollup_changes({', '.join(STABLE_KEY)})")
+        conn.executemany(f"INSERT INTO rollup_changes VALUES ({', '.join('?' * len(STABLE_KEY))})",
+                         keys.values.tolist())
+        for name in ROLLUPS:
+            grain = _grain(name, level)
+            rollup = f"rollup_{table}_{name}"
+            key = [c for c in STABLE_KEY if c in grain]
+            match = " AND ".join(f"{{t}}.{c} IS c.{c}" for c in key) or "1"
+            touched = f"EXISTS (SELECT 1 FROM rollup_changes c WHERE {match})"
+            conn.execute(f"DELETE FROM {rollup} WHERE {touched.format(t=rollup)}")
+            conn.execute(f"INSERT INTO {rollup} {_select(grain, table)} WHERE {touched.format(t=table)} "
+                         f"GROUP BY {', '.join(grain)}")
+            refreshed[rollup] = conn.execute("SELECT changes()").fetchone()[0]
+            _record(conn, rollup, table, grain)
+        conn.execute("DROP TABLE temp.rollup_changes")
+    return refreshed
+
+
+def has_rollups(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'rollup_catalog'").fetchone() is not None
+
+
+# ---------------- Query routing ----------------
+_AGG = re.compile(r"\b(AVG|SUM|MIN|MAX|COUNT)\s*\(\s*(DISTINCT\s+)?([\w*]+)\s*\)", re.IGNORECASE)
+_FROM = re.compile(r"\bFROM\s+(\w+)\s*(?=WHERE\b|GROUP\b|ORDER\b|LIMIT\b|;|$)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def _rewrite_agg(match, grain):
+    func, distinct, col = match.group(1).upper(), match.group(2), match.group(3)
+    measure = next((m for m in MEASURES if m.lower() == col.lower()), None)
+    if distinct:
+        # COUNT(DISTINCT x) is exact on a rollup when x is part of its grain
+        return match.group(0) if col.lower() in grain else None
+    if col == "*":
+        return "SUM(n_rows)" if func == "COUNT" else None
+    if measure is None:
+        return None
+    return {
+        "AVG": f"(SUM(sum_{measure}) / SUM(cnt_{measure}))",
+        "SUM": f"SUM(sum_{measure})",
+        "COUNT": f"SUM(cnt_{measure})",
+        "MIN": f"MIN(min_{measure})",
+        "MAX": f"MAX(max_{measure})",
+    }[func]
+
+
+def _try_rollup(sql, columns, grain):
+    grain_lower = {c.lower() for c in grain}
+    ok = True
+
+    def sub(match):
+        nonlocal ok
+        out = _rewrite_agg(match, grain_lower)
+        if out is None:
+            ok = False
+            return match.group(0)
+        return out
+
+    body = _AGG.sub(sub, sql)
+    if not ok:
+        return None
+    # every table column still referenced outside an aggregate must be part of the grain
+    outside = _STRING.sub("''", _AGG.sub("", sql))
+    for col in columns:
+        if col.lower() not in grain_lower and re.search(rf"\b{col}\b", outside, re.IGNORECASE):
+            return None
+    return body
+
+
+# Returns sql rewritten onto the smallest rollup that answers it, or sql unchanged
+def route(conn, sql):
+    if not has_rollups(conn):
+        return sql
+    from_match = _FROM.search(sql)
+    if (from_match is None or not _AGG.search(sql) or len(re.findall(r"\bSELECT\b", sql, re.IGNORECASE)) != 1
+            or re.search(r"\bJOIN\b|\bUNION\b|SELECT\s+\*", sql, re.IGNORECASE)):
+        return sql
+    table = from_match.group(1)
+    candidates = conn.execute("SELECT rollup, grain FROM rollup_catalog WHERE source = ? COLLATE NOCASE "
+                              "ORDER BY n_groups", (table,)).fetchall()
+    if not candidates:
+        return sql
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    for rollup, grain in candidates:
+        body = _try_rollup(sql, columns, grain.split(","))
+        if body is not None:
+            return _FROM.sub(f"FROM {rollup} ", body, count=1)
+    return sql
@@ -0,0 +1,71 @@
+import pandas as pd
+
+# ---------------- In-memory schema for Nutrition frames ----------------
+# Text columns repeat a handful of values per row, so they are held as categoricals;
+# years fit in int16 and float32 keeps ~7 significant digits, plenty for prevalence percentages.
+CATEGORICAL_COLUMNS = ["indicator", "dataset", "Region", "Gender", "Country", "age_group", "age_band",
+                       "level", "obesity_level", "malnutrition_level"]
+INTEGER_COLUMNS = {"Year": "int16"}
+FLOAT_COLUMNS = {"Mean_Estimate": "float32", "LowerBound": "float32", "UpperBound": "float32",
+                 "CI_Width": "float32"}
+
+# SQLite column types for the same columns (database.py builds its DDL from these)
+SQL_TYPES = {**{c: "TEXT" for c in CATEGORICAL_COLUMNS},
+             **{c: "INTEGER" for c in INTEGER_COLUMNS},
+             **{c: "REAL" for c in FLOAT_COLUMNS}}
+
+# nutrition.db table -> its level column
+TABLES = {"obesity": "obesity_level", "malnutrition": "malnutrition_level"}
+
+# Column order of the obesity/malnutrition tables, before the <dataset>_level column
+TABLE_COLUMNS = ["Year", "Gender", "Mean_Estimate", "LowerBound", "UpperBound", "age_group", "age_band",
+                 "Country", "Region", "CI_Width"]
+
+
+# downcast_floats=False keeps float64 estimates, for frames that are written back to disk or SQLite
+def apply_schema(df, downcast_floats=True):
+    dtypes = {}
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            dtypes[col] = "category"
+        elif col in INTEGER_COLUMNS and df[col].notna().all():
+            dtypes[col] = INTEGER_COLUMNS[col]
+        elif col in FLOAT_COLUMNS and downcast_floats:
+            dtypes[col] = FLOAT_COLUMNS[col]
+    return df.astype(dtypes) if dtypes else df
+
+
+# One table per dataset, named after it (obesity, malnutrition)
+def table_sql(dataset):
+    cols = TABLE_COLUMNS + [f"{dataset}_level"]
+    body = ", ".join(f"{c} {SQL_TYPES.get(c, 'TEXT')}" for c in cols)
+    return f"CREATE TABLE IF NOT EXISTS {dataset}({body})"
+
+
+# ---------------- Memory report ----------------
+# Deep (resident) size of a frame as plain object strings / 64-bit numbers vs with the schema applied
+def _widen(df):
+    dtypes = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == "string":
+            dtypes[col] = object
+        elif pd.api.types.is_integer_dtype(df[col].dtype) and df[col].notna().all():
+            dtypes[col] = "int64"
+        elif pd.api.types.is_float_dtype(df[col].dtype):
+            dtypes[col] = "float64"
+    return df.astype(dtypes)
+
+
+def memory_report(frames):
+    rows = []
+    for name, df in frames.items():
+        wide = _widen(df).memory_usage(deep=True).sum()
+        compact = apply_schema(df).memory_usage(deep=True).sum()
+        rows.append((name, len(df), wide, compact))
+    return rows
+
+
+def print_memory_report(frames):
+    print(f"  {'frame':<32} {'rows':>8} {'object/64-bit':>14} {'schema':>10} {'ratio':>7}")
+    for name, n, wide, compact in memory_report(frames):
+        print(f"  {name:<32} {n:>8} {wide / 1024:>11.1f} KB {compact / 1024:>7.1f} KB {wide / max(compact, 1):>6.1f}x")
@@ -0,0 +1,132 @@
+from indexes import INDEXES
+from indicators import INDICATORS
+from schema import TABLE_COLUMNS, TABLES
+
+# ---------------- Optional star layout for nutrition.db (database.py --star) ----------------
+# The loaded obesity/malnutrition tables are folded into narrow integer-keyed fact tables
+# (fact_obesity, fact_malnutrition) sharing small dimension tables, then replaced by views with
+# the same names and columns, so the query catalog keeps working unchanged.
+# Queries written against the fact tables group and join on integer keys.
+
+# dimension -> source column in obesity/malnutrition ({level} is the <dataset>_level column).
+# age_group is reached through dim_indicator: each indicator has exactly one age group.
+DIMENSIONS = {
+    "country": "Country",
+    "region": "Region",
+    "gender": "Gender",
+    "age_group": "age_group",
+    "age_band": "age_band",
+    "level": "{level}",
+}
+FACT_DIMENSIONS = [dim for dim in DIMENSIONS if dim != "age_group"]
+
+# fact column -> table column, for the measures carried as-is
+MEASURES = {
+    "year": "Year",
+    "mean_estimate": "Mean_Estimate",
+    "lower_bound": "LowerBound",
+    "upper_bound": "UpperBound",
+    "ci_width": "CI_Width",
+}
+
+# Table column -> fact column, used to carry the catalog indexes (indexes.INDEXES) over to the facts
+FACT_COLUMNS = {
+    **{DIMENSIONS[dim]: f"{dim}_id" for dim in FACT_DIMENSIONS},
+    **{column: fact for fact, column in MEASURES.items()},
+    "age_group": "indicator_id",
+}
+
+
+def is_star(conn, table="obesity"):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?", (table,)).fetchone() is not None
+
+
+# Removes the star tables left over from an earlier --star load
+def drop_star(conn, tables=TABLES):
+    with conn:
+        for name in [f"fact_{t}" for t in tables] + ["dim_indicator"] + [f"dim_{dim}" for dim in DIMENSIONS]:
+            conn.execute(f"DROP TABLE IF EXISTS {name}")
+
+
+def _dimension_tables(conn, tables):
+    # A missing value (e.g. age_band in tables loaded from pre-age_band files) gets its own member
+    # with a NULL name, so every fact row has every key and the views can use inner joins
+    for dim, column in DIMENSIONS.items():
+        distinct = " UNION ".join(f"SELECT {column.format(level=level)} FROM {table}" for table, level in tables.items())
+        conn.execute(f"DROP TABLE IF EXISTS dim_{dim}")
+        conn.execute(f"CREATE TABLE dim_{dim}({dim}_id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+        conn.execute(f"INSERT INTO dim_{dim}(name) {distinct} ORDER BY 1")
+
+    # One indicator per (dataset, age_group), named by its GHO code from indicators.json
+    conn.execute("DROP TABLE IF EXISTS dim_indicator")
+    conn.execute("""
+    CREATE TABLE dim_indicator(
+        indicator_id INTEGER PRIMARY KEY, code TEXT, dataset TEXT NOT NULL, age_group_id INTEGER,
+        UNIQUE(dataset, age_group_id)
+    )
+    """)
+    conn.executemany(
+        "INSERT OR IGNORE INTO dim_indicator(code, dataset, age_group_id) "
+        "SELECT ?, ?, age_group_id FROM dim_age_group WHERE name IS ?",
+        [(code, spec["dataset"], spec["age_group"]) for code, spec in INDICATORS.items() if spec["dataset"] in tables])
+    for table in tables:
+        conn.execute(f"""
+        INSERT OR IGNORE INTO dim_indicator(dataset, age_group_id)
+        SELECT DISTINCT '{table}', a.age_group_id FROM {table} t JOIN dim_age_group a ON a.name IS t.age_group
+        """)
+
+
+def _fact_table(conn, table, level):
+    ids = ", ".join(f"{dim}_id INTEGER NOT NULL" for dim in FACT_DIMENSIONS)
+    conn.execute(f"DROP TABLE IF EXISTS fact_{table}")
+    conn.execute(f"""
+    CREATE TABLE fact_{table}(
+        indicator_id INTEGER NOT NULL, {ids}, year INTEGER NOT NULL,
+        mean_estimate REAL, lower_bound REAL, upper_bound REAL, ci_width REAL
+    )
+    """)
+    joins = " ".join(f"JOIN dim_{dim} d_{dim} ON d_{dim}.name IS t.{DIMENSIONS[dim].format(level=level)}"
+                     for dim in FACT_DIMENSIONS)
+    conn.execute(f"""
+    INSERT INTO fact_{table}(indicator_id, {', '.join(f'{dim}_id' for dim in FACT_DIMENSIONS)}, {', '.join(MEASURES)})
+    SELECT i.indicator_id, {', '.join(f'd_{dim}.{dim}_id' for dim in FACT_DIMENSIONS)},
+           {', '.join(f't.{c}' for c in MEASURES.values())}
+    FROM {table} t
+    JOIN dim_age_group a ON a.name IS t.age_group
+    JOIN dim_indicator i ON i.dataset = '{table}' AND i.age_group_id = a.age_group_id
+    {joins}
+    """)
+    # The catalog index set, on integer keys
+    for suffix, columns in INDEXES.items():
+        cols = ", ".join("level_id" if c == "{level}" else FACT_COLUMNS[c] for c in columns)
+        conn.execute(f"CREATE INDEX ix_fact_{table}_{suffix} ON fact_{table}({cols})")
+
+
+# Same name, columns and column order as the table it replaces. Inner joins on the integer keys
+# let SQLite start from a dimension (WHERE Country = 'India' -> one country_id -> index search).
+def view_sql(table, level):
+    exprs = {column: f"f.{fact}" for fact, column in MEASURES.items()}
+    exprs["age_group"] = "d_age_group.name"
+    joins = ["JOIN dim_indicator i ON i.indicator_id = f.indicator_id",
+             "JOIN dim_age_group d_age_group ON d_age_group.age_group_id = i.age_group_id"]
+    for dim in FACT_DIMENSIONS:
+        exprs[DIMENSIONS[dim].format(level=level)] = f"d_{dim}.name"
+        joins.append(f"JOIN dim_{dim} d_{dim} ON d_{dim}.{dim}_id = f.{dim}_id")
+    cols = ", ".join(f"{exprs[c]} AS {c}" for c in TABLE_COLUMNS + [level])
+    return f"CREATE VIEW {table} AS SELECT {cols} FROM fact_{table} f {' '.join(joins)}"
+
+
+# Converts freshly loaded obesity/malnutrition tables into the star layout, in one transaction
+def build_star(conn, tables=TABLES):
+    conn.execute("BEGIN")
+    try:
+        _dimension_tables(conn, tables)
+        for table, level in tables.items():
+            _fact_table(conn, table, level)
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(view_sql(table, level))
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return {table: conn.execute(f"SELECT COUNT(*) FROM fact_{table}").fetchone()[0] for table in tables}
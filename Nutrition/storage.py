@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+from schema import apply_schema
+
+# ---------------- Storage for Nutrition intermediates ----------------
+# Frames are written as typed, compressed Parquet with dictionary-encoded (categorical) text columns
+# and full-precision estimates; readers get the compact in-memory schema from schema.py.
+# pyarrow is optional: without it, and for any file that only exists as CSV, CSV is used instead.
+try:
+    import pyarrow.parquet
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+COMPRESSION = "zstd"
+
+
+# name is the file name without extension, e.g. "df_obesity_clean"
+def write_frame(df, name, csv=False):
+    df = apply_schema(df, downcast_floats=False)
+    written = []
+    if HAS_PARQUET:
+        df.to_parquet(f"{name}.parquet", compression=COMPRESSION, index=False)
+        written.append(f"{name}.parquet")
+    if csv or not HAS_PARQUET:
+        df.to_csv(f"{name}.csv", index=False)
+        written.append(f"{name}.csv")
+    return written
+
+
+# columns limits the read to what the caller needs (Parquet only reads those column chunks); those
+# the file does not have are skipped (files written before age_band existed have no age_band).
+# downcast_floats=False keeps float64 estimates for callers that write the frame back out
+def read_frame(name, columns=None, downcast_floats=True):
+    if HAS_PARQUET and os.path.exists(f"{name}.parquet"):
+        if columns is not None:
+            names = pyarrow.parquet.read_schema(f"{name}.parquet").names
+            columns = [c for c in columns if c in names]
+        df = pd.read_parquet(f"{name}.parquet", columns=columns)
+    else:
+        df = pd.read_csv(f"{name}.csv", usecols=None if columns is None else lambda c: c in columns)
+    return apply_schema(df, downcast_floats)
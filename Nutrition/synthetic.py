@@ -0,0 +1,102 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from indicators import INDICATORS
+from schema import TABLES, apply_schema
+from storage import HAS_PARQUET, read_frame
+
+if HAS_PARQUET:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+# ---------------- Synthetic obesity/malnutrition tables at N x the real size ----------------
+# python synthetic.py SCALE [OUT_DIR] [--seed N]
+# Writes df_<dataset>_clean_verified files like eda_clean_visualize.py, so database.py, queries.py,
+# app.py and the backends run unchanged inside OUT_DIR.
+# Copy i of every real country becomes a new country "<name> ~i" in the same region (copy 0 is the
+# real data): Year, Gender, age_group, age_band and Region keep their cardinalities, Country grows
+# with the scale and the natural key stays unique. Each synthetic country gets its own level
+# (lognormal country factor) plus per-row noise, applied to the estimate and both bounds together,
+# so estimates stay inside their intervals and CI_Width keeps its shape; levels are re-derived from
+# the indicator thresholds. Copies are generated and appended in chunks, so 1000x never sits in memory.
+COUNTRY_SIGMA = 0.15
+ROW_SIGMA = 0.03
+CHUNK_COPIES = 20
+ESTIMATES = ["Mean_Estimate", "LowerBound", "UpperBound"]
+
+
+def _thresholds(dataset):
+    return next(spec["levels"] for spec in INDICATORS.values() if spec["dataset"] == dataset)
+
+
+def synthesize(base, dataset, copies, seed=0):
+    n, copies = len(base), np.asarray(copies)
+    rng = np.random.default_rng([seed, int(copies[0])])
+    rows = np.tile(np.arange(n), len(copies))
+    copy_no = np.repeat(copies, n)
+    df = base.iloc[rows].reset_index(drop=True)
+
+    country = base['Country'].astype("category")
+    names = country.cat.categories
+    codes = np.tile(country.cat.codes.to_numpy(), len(copies)) + np.repeat(np.arange(len(copies)), n) * len(names)
+    labels = [name if i == 0 else f"{name} ~{i}" for i in copies for name in names]
+    df['Country'] = pd.Categorical.from_codes(codes, categories=labels)
+
+    # mean-one lognormal factors; copy 0 keeps the real values
+    country_factor = np.exp(rng.normal(-COUNTRY_SIGMA ** 2 / 2, COUNTRY_SIGMA, len(labels)))[codes]
+    row_factor = np.exp(rng.normal(-ROW_SIGMA ** 2 / 2, ROW_SIGMA, len(df)))
+    factor = np.where(copy_no == 0, 1.0, country_factor * row_factor)
+    for col in ESTIMATES:
+        df[col] = np.minimum(df[col].to_numpy(dtype=float) * factor, 100.0)
+    df['CI_Width'] = df['UpperBound'] - df['LowerBound']
+
+    levels = _thresholds(dataset)
+    x = df['Mean_Estimate'].to_numpy(dtype=float)
+    df[f"{dataset}_level"] = np.select([x >= levels["high"], x >= levels["moderate"]], ['High', 'Moderate'],
+                                       default='Low')
+    return apply_schema(df, downcast_floats=False)
+
+
+# Appends scale copies of base to <out_dir>/df_<dataset>_clean_verified.parquet (.csv without pyarrow)
+def write_synthetic(base, dataset, scale, out_dir, seed=0, chunk_copies=CHUNK_COPIES):
+    name = os.path.join(out_dir, f"df_{dataset}_clean_verified")
+    path = f"{name}.parquet" if HAS_PARQUET else f"{name}.csv"
+    writer, rows = None, 0
+    try:
+        for start in range(0, scale, chunk_copies):
+            chunk = synthesize(base, dataset, range(start, min(start + chunk_copies, scale)), seed)
+            rows += len(chunk)
+            if HAS_PARQUET:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+                writer.write_table(table.cast(writer.schema))
+            else:
+                chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path, rows
+
+
+def generate(scale, out_dir, seed=0, tables=TABLES):
+    os.makedirs(out_dir, exist_ok=True)
+    written = {}
+    for dataset in tables:
+        base = read_frame(f"df_{dataset}_clean_verified", downcast_floats=False)
+        written[dataset] = write_synthetic(base, dataset, scale, out_dir, seed)
+    return written
+
+
+if __name__ == "__main__":
+    args, seed = sys.argv[1:], 0
+    if "--seed" in args:
+        i = args.index("--seed")
+        seed = int(args[i + 1])
+        del args[i:i + 2]
+    scale = int(args[0]) if args else 10
+    out_dir = args[1] if len(args) > 1 else f"synthetic_x{scale}"
+    for dataset, (path, rows) in generate(scale, out_dir, seed).items():
+        print(f"{dataset}: {rows} rows -> {path}")
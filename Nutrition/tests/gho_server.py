@@ -0,0 +1,105 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# ---------------- Stand-in GHO OData server ----------------
+# Serves canned {"value": [...]} payloads at /api/<indicator code>, so gho_client.py and the
+# scripts can run without the real API:
+#     python tests/gho_server.py [PORT]
+#     GHO_API_BASE=http://127.0.0.1:PORT/api python get_data.py
+# Tests start it in a thread (start()) and set per-indicator behaviour: fail the first N requests
+# with a status, or delay each response. Every request is recorded in server.hits.
+# OData query options ($filter, $select) are ignored: every record of the indicator is returned.
+COUNTRIES = ["IND", "NGA", "BRA", "USA"]
+REGIONS = {"IND": "South-East Asia", "NGA": "Africa", "BRA": "Americas", "USA": "Americas"}
+SEXES = ["SEX_MLE", "SEX_FMLE", "SEX_BTSX"]
+YEARS = range(2012, 2023)
+
+
+# Child/adolescent indicators carry an age band in Dim2, adult ones none
+def canned_records(code, age_group=None):
+    age_band = "AGEGROUP_YEARS05-19" if age_group == "Child/Adolescent" else None
+    records = []
+    for i, (country, sex, year) in enumerate((c, s, y) for c in COUNTRIES for s in SEXES for y in YEARS):
+        value = 5.0 + (i % 17) + (year - 2012) * 0.3
+        records.append({"Id": i, "IndicatorCode": code, "SpatialDim": country, "ParentLocation": REGIONS[country],
+                        "Dim1": sex, "Dim2": age_band, "TimeDim": year, "NumericValue": value,
+                        "Low": value - 1.5, "High": value + 1.5, "Date": "2024-02-20T10:00:00+01:00"})
+    return records
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        code = urlparse(self.path).path.rstrip("/").split("/")[-1]
+        with server.lock:
+            server.hits.append((code, time.perf_counter()))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            failures = server.failures.get(code)
+            fail = failures is not None and failures[0] > 0
+            if fail:
+                server.failures[code] = (failures[0] - 1, failures[1])
+        try:
+            time.sleep(server.delays.get(code, 0))
+            if fail:
+                self.send_response(failures[1])
+                self.end_headers()
+            elif code not in server.data:
+                self.send_response(404)
+                self.end_headers()
+            else:
+                body = json.dumps({"value": server.data[code]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class GHOServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, data=None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.data = data if data is not None else {}
+        self.failures = {}   # code -> (requests left to fail, status)
+        self.delays = {}     # code -> seconds per response
+        self.hits = []       # (code, perf_counter time)
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+    def fail(self, code, times, status=503):
+        self.failures[code] = (times, status)
+
+    def hit_times(self, code):
+        return [t for c, t in self.hits if c == code]
+
+
+# Server with canned data for the given indicators (indicators.INDICATORS), in a thread
+def start(indicators, port=0):
+    server = GHOServer(port, {spec["code"]: canned_records(spec["code"], spec.get("age_group"))
+                               for spec in indicators.values()})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ".")
+    from indicators import INDICATORS
+    server = start(INDICATORS, int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Serving {len(server.data)} indicators at {server.base}")
+    threading.Event().wait()
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pandas as pd
+
+from forecast import COLUMNS, rebuild_forecasts
+from result_cache import read_data_version
+from schema import TABLE_COLUMNS, table_sql
+from storage import write_frame
+
+DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database.py")
+
+
+# Years of one series per country, fewer than MIN_YEARS (3) of them
+def _frame(level_col, years=(2021, 2022), countries=("Kenya", "Peru")):
+    rows = [{"Year": year, "Gender": "Female", "Mean_Estimate": 10.0 + i, "LowerBound": 8.0 + i,
+             "UpperBound": 12.0 + i, "age_group": "Adults", "age_band": "18+", "Country": country,
+             "Region": "Africa", "CI_Width": 4.0, level_col: "Low"}
+            for country in countries for i, year in enumerate(years)]
+    return pd.DataFrame(rows, columns=TABLE_COLUMNS + [level_col])
+
+
+def _forecast_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info(forecast_{table})")]
+
+
+# No series long enough to project, and an empty table: empty forecast tables, no error
+def test_short_history_gives_empty_forecasts():
+    conn = sqlite3.connect(":memory:")
+    for table, df in (("malnutrition", _frame("malnutrition_level")), ("obesity", _frame("obesity_level")[:0])):
+        conn.execute(table_sql(table))
+        conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(df.columns))})", df.values.tolist())
+    assert rebuild_forecasts(conn) == {"forecast_obesity": 0, "forecast_malnutrition": 0}
+    for table in ("obesity", "malnutrition"):
+        assert _forecast_columns(conn, table) == COLUMNS
+
+
+# database.py refits forecasts before bumping the data version; a short-history load must finish
+def test_short_history_load_completes(tmp_path):
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        write_frame(_frame("obesity_level", years=(2022,)), "df_obesity_clean_verified")
+        write_frame(_frame("malnutrition_level"), "df_malnutrition_clean_verified")
+    finally:
+        os.chdir(cwd)
+    result = subprocess.run([sys.executable, DATABASE], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    conn = sqlite3.connect(tmp_path / "nutrition.db")
+    assert read_data_version(conn)[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM forecast_malnutrition").fetchone()[0] == 0
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+import requests
+
+import gho_server
+from gho_client import fetch_all_frames, fetch_frame, make_session
+from indicators import COLUMNS, INDICATORS, indicator_urls
+
+BACKOFF = 0.2
+
+
+@pytest.fixture
+def server():
+    server = gho_server.start(INDICATORS)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, code):
+    return indicator_urls({code: INDICATORS[code]}, base=server.base)[code]
+
+
+def test_retries_with_backoff_then_succeeds(server):
+    code = "NCD_BMI_30C"
+    server.fail(code, 2, status=503)
+    session = make_session(backoff=BACKOFF)
+    frame, stats = fetch_frame(session, code, _url(server, code), COLUMNS)
+    times = server.hit_times(code)
+    assert stats["status"] == 200 and len(frame) == len(server.data[code])
+    assert len(times) == 3
+    # urllib3 retries the first failure at once, then sleeps backoff * 2 ** (n - 1)
+    assert times[2] - times[1] >= 2 * BACKOFF * 0.9
+
+
+def test_gives_up_after_retries(server):
+    code = "NCD_BMI_18C"
+    server.fail(code, 100, status=500)
+    session = make_session(retries=2, backoff=0.01)
+    with pytest.raises(requests.HTTPError):
+        fetch_frame(session, code, _url(server, code), COLUMNS)
+    assert len(server.hit_times(code)) == 3
+
+
+def test_fetch_all_frames_runs_indicators_in_parallel(server):
+    delay = 0.4
+    for code in INDICATORS:
+        server.delays[code] = delay
+    start = time.perf_counter()
+    frames, stats = fetch_all_frames(indicator_urls(INDICATORS, base=server.base), COLUMNS, max_workers=len(INDICATORS))
+    wall = time.perf_counter() - start
+    assert server.max_in_flight == len(INDICATORS)
+    assert wall < delay * len(INDICATORS) / 2
+    assert {code: len(frame) for code, frame in frames.items()} == {code: len(server.data[code]) for code in INDICATORS}
+    assert sorted(s["indicator"] for s in stats) == sorted(INDICATORS)
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import gho_server
+from indicators import INDICATORS
+from result_cache import read_data_version
+from schema import table_sql
+
+REFRESH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "refresh_data.py")
+
+
+@pytest.fixture
+def server():
+    server = gho_server.start(INDICATORS)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _refresh(workdir, server):
+    env = dict(os.environ, GHO_API_BASE=server.base, GHO_CACHE_DIR=str(workdir / ".gho_cache"))
+    result = subprocess.run([sys.executable, REFRESH], cwd=workdir, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def _marks(conn):
+    return {row[0] for row in conn.execute("SELECT indicator FROM ingest_state")}
+
+
+# Step 4 skips datasets without a table (run database.py first); their records must be fetched again
+def test_skipped_datasets_keep_marks_and_version(tmp_path, server):
+    out = _refresh(tmp_path, server)
+    conn = sqlite3.connect(tmp_path / "nutrition.db")
+    assert "no such table in nutrition.db, skipped" in out
+    assert _marks(conn) == set()
+    assert read_data_version(conn) is None
+
+
+def test_only_upserted_datasets_advance(tmp_path, server):
+    conn = sqlite3.connect(tmp_path / "nutrition.db")
+    conn.execute(table_sql("obesity"))
+    conn.commit()
+    _refresh(tmp_path, server)
+    obesity = {code for code, spec in INDICATORS.items() if spec["dataset"] == "obesity"}
+    assert _marks(conn) == obesity
+    assert read_data_version(conn)[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM obesity").fetchone()[0] > 0
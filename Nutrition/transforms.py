@@ -0,0 +1,127 @@
+import csv
+import os
+import time
+
+import numpy as np
+from indicators import level_thresholds
+
+# ---------------- Cleaning rules shared by get_data.py and refresh_data.py ----------------
+RENAME_COLUMNS = {
+    'TimeDim': 'Year',
+    'Dim1': 'Gender',
+    'Dim2': 'age_band',
+    'NumericValue': 'Mean_Estimate',
+    'Low': 'LowerBound',
+    'High': 'UpperBound',
+    'ParentLocation': 'Region',
+    'SpatialDim': 'Country'
+}
+
+GENDER_MAP = {'sex_mle': 'Male', 'sex_fmle': 'Female', 'sex_btsx': 'Both'}
+
+# One row per key in obesity/malnutrition; refresh_data.py upserts on it
+NATURAL_KEY = ['Country', 'Year', 'Gender', 'age_group', 'age_band']
+
+# Adult indicators have no GHO age band; child indicators report 5-9, 10-19 and 5-19 separately
+ALL_AGES = 'All'
+
+# GHO SpatialDim -> country/aggregate name, prebuilt by build_country_codes.py
+COUNTRY_CODES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "country_codes.csv")
+_country_names = None
+
+
+def country_names():
+    global _country_names
+    if _country_names is None:
+        with open(COUNTRY_CODES_FILE, newline="", encoding="utf-8") as f:
+            _country_names = {row["code"]: row["name"] for row in csv.DictReader(f)}
+    return _country_names
+
+
+# Maps each distinct code once through a categorical; unknown codes are kept as-is
+def convert_countries(codes):
+    names = country_names()
+    return codes.astype("category").map(lambda code: names.get(code, code))
+
+
+# ---------------- Declarative transform spec ----------------
+# Every indicator goes through the same stages on one long-format frame
+# (tagged by 'indicator' and 'dataset' columns); thresholds come from indicators.json.
+TRANSFORM_SPEC = {
+    "rename": RENAME_COLUMNS,
+    "fill": {"age_band": ALL_AGES},
+    "gender_map": GENDER_MAP,
+    "ci_width": ("LowerBound", "UpperBound"),
+    # per indicator code: High if Mean_Estimate >= high, Moderate if >= moderate, else Low
+    "levels": level_thresholds(),
+}
+
+
+def _rename(df, spec):
+    return df.rename(columns=spec["rename"])
+
+
+def _fill(df, spec):
+    for col, value in spec["fill"].items():
+        df[col] = df[col].astype(object).fillna(value)
+    return df
+
+
+def _gender(df, spec):
+    df['Gender'] = df['Gender'].str.lower().replace(spec["gender_map"])
+    return df
+
+
+def _country(df, spec):
+    df['Country'] = convert_countries(df['Country'])
+    return df
+
+
+def _ci_width(df, spec):
+    low, high = spec["ci_width"]
+    df['CI_Width'] = df[high] - df[low]
+    return df
+
+
+def _levels(df, spec):
+    indicator = df['indicator'].astype(object)
+    moderate = indicator.map({i: t["moderate"] for i, t in spec["levels"].items()}).to_numpy(dtype=float)
+    high = indicator.map({i: t["high"] for i, t in spec["levels"].items()}).to_numpy(dtype=float)
+    x = df['Mean_Estimate'].to_numpy(dtype=float)
+    df['level'] = np.select([x >= high, x >= moderate], ['High', 'Moderate'], default='Low')
+    return df
+
+
+STAGES = [
+    ("rename", _rename),
+    ("fill", _fill),
+    ("gender", _gender),
+    ("country", _country),
+    ("ci_width", _ci_width),
+    ("levels", _levels),
+]
+
+
+# ---------------- Run all stages, timing each one ----------------
+def run_transforms(df, spec=TRANSFORM_SPEC):
+    timings = []
+    for name, stage in STAGES:
+        start = time.perf_counter()
+        df = stage(df, spec)
+        timings.append((name, time.perf_counter() - start))
+    return df, timings
+
+
+def print_timings(timings, rows):
+    for name, seconds in timings:
+        print(f"  {name:<10} {seconds * 1000:>8.1f} ms")
+    print(f"  total      {sum(s for _, s in timings) * 1000:>8.1f} ms for {rows} rows")
+
+
+# Long-format fact table -> one frame per dataset, with the level column named <dataset>_level
+def split_datasets(df):
+    frames = {}
+    for dataset in df['dataset'].astype(object).unique():
+        part = df[df['dataset'] == dataset].drop(columns=['indicator', 'dataset'])
+        frames[dataset] = part.rename(columns={'level': f'{dataset}_level'}).reset_index(drop=True)
+    return frames
@@ -0,0 +1,158 @@
+import sqlite3
+import sys
+
+from fetch import fetch_frame
+from schema import TABLES
+
+# ---------------- Year-over-year trend tables ----------------
+# trend_<table> has one row per series (Country x Gender x age_group) and Year: the series'
+# average estimate that year, the step from the previous year it has data for (delta, delta_pct,
+# step up/down/flat), and the whole series' first/last year, change, least-squares slope in
+# points per year and direction. It is built in one window pass over the series-year averages,
+# so trend questions ("which series are rising?", "how did India change year by year?") are
+# index lookups here instead of group-bys over the fact rows:
+#   ix_trend_<table>_series    (Country, Gender, age_group, Year)   one country / series
+#   ix_trend_<table>_direction (direction, slope), latest year only  rising or falling series
+# The dashboard's rising/falling view reads them, and route_trends() answers catalog queries that
+# TREND_PLANS knows from them (SQLite only; elsewhere the catalog SQL computes the same slopes).
+SERIES = ["Country", "Gender", "age_group"]
+FLAT_SLOPE = 0.05   # |slope| up to this many points per year counts as flat
+
+# Catalog name -> (table, SQL over trend_<table>); same result as the catalog SQL
+TREND_PLANS = {
+    "Countries with increasing malnutrition": ("malnutrition", """
+SELECT Country, COUNT(*) AS Rising_Series, MAX(slope) AS Max_Slope
+FROM trend_malnutrition
+WHERE direction = 'up' AND Year = last_year
+GROUP BY Country
+ORDER BY Max_Slope DESC, Country"""),
+}
+
+
+def _trend_select(table, where=""):
+    series = ", ".join(SERIES)
+    return f"""
+SELECT *, CASE WHEN slope > {FLAT_SLOPE} THEN 'up' WHEN slope < -{FLAT_SLOPE} THEN 'down' ELSE 'flat' END AS direction
+FROM (
+    SELECT {series}, Region, Year, estimate, n_rows,
+           LAG(Year) OVER w AS prev_year,
+           estimate - LAG(estimate) OVER w AS delta,
+           100.0 * (estimate - LAG(estimate) OVER w) / NULLIF(LAG(estimate) OVER w, 0) AS delta_pct,
+           CASE WHEN estimate > LAG(estimate) OVER w THEN 'up' WHEN estimate < LAG(estimate) OVER w THEN 'down'
+                WHEN estimate = LAG(estimate) OVER w THEN 'flat' END AS step,
+           FIRST_VALUE(Year) OVER s AS first_year,
+           LAST_VALUE(Year) OVER s AS last_year,
+           COUNT(*) OVER s AS n_years,
+           LAST_VALUE(estimate) OVER s - FIRST_VALUE(estimate) OVER s AS change,
+           (COUNT(*) OVER s * SUM(Year * estimate) OVER s - SUM(Year) OVER s * SUM(estimate) OVER s)
+               / NULLIF(COUNT(*) OVER s * SUM(Year * Year) OVER s - SUM(Year) OVER s * SUM(Year) OVER s, 0) AS slope
+    FROM (
+        SELECT {series}, Year, MIN(Region) AS Region, AVG(Mean_Estimate) AS estimate, COUNT(*) AS n_rows
+        FROM {table} t
+        WHERE Year IS NOT NULL AND Mean_Estimate IS NOT NULL{where}
+        GROUP BY {series}, Year
+    )
+    WINDOW w AS (PARTITION BY {series} ORDER BY Year),
+           s AS (PARTITION BY {series} ORDER BY Year ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+)"""
+
+
+def _create_indexes(conn, trend):
+    conn.execute(f"CREATE INDEX ix_{trend}_series ON {trend}({', '.join(SERIES)}, Year)")
+    conn.execute(f"CREATE INDEX ix_{trend}_direction ON {trend}(direction, slope) WHERE Year = last_year")
+
+
+# ---------------- Build and incremental refresh ----------------
+def build_trends(conn, tables=TABLES):
+    built = {}
+    with conn:
+        for table in tables:
+            trend = f"trend_{table}"
+            conn.execute(f"DROP TABLE IF EXISTS {trend}")
+            conn.execute(f"CREATE TABLE {trend} AS {_trend_select(table)}")
+            _create_indexes(conn, trend)
+            built[trend] = conn.execute(f"SELECT COUNT(*) FROM {trend}").fetchone()[0]
+    return built
+
+
+# changed holds the rows just upserted into table (at least the SERIES columns); only the series
+# they belong to are deleted and recomputed
+def refresh_trends(conn, table, changed):
+    trend = f"trend_{table}"
+    if not has_trends(conn, table) or changed.empty:
+        return 0
+    keys = changed[SERIES].drop_duplicates()
+    match = " AND ".join(f"{{t}}.{c} IS c.{c}" for c in SERIES)
+    touched = f"EXISTS (SELECT 1 FROM trend_changes c WHERE {match})"
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp.trend_changes")
+        conn.execute(f"CREATE TEMP TABLE trend_changes({', '.join(SERIES)})")
+        conn.executemany(f"INSERT INTO trend_changes VALUES ({', '.join('?' * len(SERIES))})",
+                         keys.astype(object).where(keys.notna(), None).values.tolist())
+        conn.execute(f"DELETE FROM {trend} WHERE {touched.format(t=trend)}")
+        conn.execute(f"INSERT INTO {trend} {_trend_select(table, ' AND ' + touched.format(t='t'))}")
+        refreshed = conn.execute("SELECT changes()").fetchone()[0]
+        conn.execute("DROP TABLE temp.trend_changes")
+    return refreshed
+
+
+def has_trends(conn, table):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (f"trend_{table}",)).fetchone() is not None
+
+
+# Catalog SQL for name, replaced by its TREND_PLANS version when the trend table exists
+def route_trends(conn, name, sql):
+    table, trend_sql = TREND_PLANS.get(name, (None, None))
+    return trend_sql if table is not None and has_trends(conn, table) else sql
+
+
+# ---------------- Trend lookups ----------------
+# One row per series (its latest year), steepest rise first (steepest fall first for direction
+# 'down'), at most limit rows; country / direction use the indexes
+def series_trends(conn, table, country=None, direction=None, limit=None):
+    filters, params = ["Year = last_year"], []
+    if country is not None:
+        filters.append("Country = ?")
+        params.append(country)
+    if direction is not None:
+        filters.append("direction = ?")
+        params.append(direction)
+    order = "ASC" if direction == "down" else "DESC"
+    return fetch_frame(conn.execute(
+        f"SELECT {', '.join(SERIES)}, Region, first_year, last_year, n_years, estimate AS latest, change, slope, "
+        f"direction FROM trend_{table} WHERE {' AND '.join(filters)} ORDER BY slope {order}"
+        + (f" LIMIT {int(limit)}" if limit is not None else ""), params))
+
+
+# Series per direction (up / down / flat), from the direction index
+def direction_counts(conn, table):
+    return dict(conn.execute(f"SELECT direction, COUNT(*) FROM trend_{table} WHERE Year = last_year "
+                             f"GROUP BY direction").fetchall())
+
+
+# Year-by-year steps of every series of one country
+def country_steps(conn, table, country):
+    return fetch_frame(conn.execute(
+        f"SELECT {', '.join(SERIES)}, Year, estimate, delta, delta_pct, step FROM trend_{table} "
+        f"WHERE Country = ? ORDER BY {', '.join(SERIES)}, Year", (country,)))
+
+
+# python trends.py [TABLE] [--country NAME] [--direction up|down|flat] [--steps]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(flag):
+        return args[args.index(flag) + 1] if flag in args else None
+
+    table = args[0] if args and not args[0].startswith("--") else "malnutrition"
+    country, direction = option("--country"), option("--direction")
+    conn = sqlite3.connect("nutrition.db")
+    if not has_trends(conn, table):
+        sys.exit(f"no trend_{table} in nutrition.db, run database.py first")
+    if "--steps" in args and country:
+        print(country_steps(conn, table, country).to_string(index=False))
+    else:
+        trends = series_trends(conn, table, country, direction)
+        print(trends.to_string(index=False, max_rows=60))
+        print(f"\n{len(trends)} series; by direction: {trends['direction'].value_counts().to_dict()}")
+    conn.close()